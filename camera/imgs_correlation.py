@@ -11,6 +11,9 @@
 import os
 import sys
 import argparse
+import threading
+import queue
+import numpy as np
 import matplotlib.pyplot as plt
 
 # check PYTHONPATH
@@ -36,6 +39,50 @@ class ImgsCorrelation(TemplateBase):
         self.wrt = CsvWriter(fname=args.output, dt=self.tformat,
                              filt=['id', 'name', 'datetime', 'east', 'north'])
         self.rdr = ImageReader(args.names)
+        # output record reused for each image, CsvWriter writes it at once
+        self.data = {'id': None, 'name': None, 'datetime': None,
+                     'east': None, 'north': None}
+        self.batch = max(1, args.batch)
+        self.buf = None     # grayscale images of a batch
+
+    def read_frames(self, q):
+        """ read images in a separate thread into queue, so reading
+            and processing images overlap, None frame is put at the end
+
+            :param q: queue to put frame, time, index and name
+        """
+        while True:
+            frame, t = self.rdr.GetNext()
+            q.put((frame, t, self.rdr.ind, self.rdr.srcname))
+            if frame is None:
+                break
+
+    def process_batch(self, items):
+        """ convert a batch of images to grayscale into a contiguous buffer
+            and find template on them
+
+            :param items: list of frame, time, index and name tuples
+        """
+        h, w = items[0][0].shape[:2]
+        if self.buf is None or self.buf.shape[1:] != (h, w):
+            self.buf = np.empty((self.batch, h, w), dtype=np.uint8)
+        grays = []
+        for k, item in enumerate(items):
+            gray = None     # different size images are not buffered
+            if item[0].shape[:2] == (h, w):
+                gray = self.to_gray(item[0], self.buf[k])
+            grays.append(gray)
+        for gray, (frame, t, ind, srcname) in zip(grays, items):
+            # color frame is kept for debug display
+            res = self.ProcessImg(frame, ind, gray)
+            if res:
+                data = self.data
+                data['id'] = ind
+                data['name'] = os.path.basename(srcname)
+                data['datetime'] = t
+                data['east'] = res["east"]
+                data['north'] = res["north"]
+                self.wrt.WriteData(data)
 
     def process(self):
         """ process image serie
@@ -44,18 +91,20 @@ class ImgsCorrelation(TemplateBase):
         if self.debug:
             # prepare animated figure
             plt.ion()
+        q = queue.Queue(maxsize=4)
+        thr = threading.Thread(target=self.read_frames, args=(q,), daemon=True)
+        thr.start()
+        items = []
         while True:
-            frame, t = self.rdr.GetNext()
-            if frame is not None:
-                name1 = os.path.split(self.rdr.srcname)[1]
-                res = self.ProcessImg(frame, self.rdr.ind)
-                if res:
-                    data = {'id': self.rdr.ind, 'name': name1,
-                            'datetime': t,
-                            'east': res["east"], 'north': res["north"]}
-                    self.wrt.WriteData(data)
-            else:
+            item = q.get()
+            if item[0] is not None:
+                items.append(item)
+            if items and (len(items) == self.batch or item[0] is None):
+                self.process_batch(items)
+                items = []
+            if item[0] is None:
                 break
+        thr.join()
 
 if __name__ == "__main__":
     # set up command line parameters
@@ -66,10 +115,25 @@ if __name__ == "__main__":
                         help='template image to find in video frames')
     parser.add_argument('-m', '--method', type=int, default=5,
                         help='method to compare video frame and template, 0/1/2/3/4/5 TM_SQDIFF/TM_SQDIFF_NORMED/TM_CCORR/TM_CCORR_NORMED/CV_TM_CCOEFF/CV_TM_CCOEFF_NORMED, default 5')
+    parser.add_argument('--ssd_impl', type=str, default='opencv',
+                        choices=['opencv', 'numpy', 'numba', 'fft'],
+                        help='implementation of sum of squared differences for method 99, default opencv')
     parser.add_argument('-r', '--refresh_template', action="store_true",
                         help='refresh template after each frames')
+    parser.add_argument('--gray_channel', action="store_true",
+                        help='use green channel of color images instead of grayscale conversion')
+    parser.add_argument('--pyramid', type=int, default=0,
+                        help='number of pyramid levels for coarse search, the position is refined on the full resolution image, default 0 (off)')
     parser.add_argument('--fast', action="store_true",
                         help='reduce input image size to double the template')
+    parser.add_argument('--roi_radius', type=int, default=None,
+                        help='search range around the last position in pixels with --fast, default half of the template size')
+    parser.add_argument('--lost_limit', type=float, default=None,
+                        help='statistic limit for lost target with --fast, the next frame is searched entirely, default None (off)')
+    parser.add_argument('--batch', type=int, default=8,
+                        help='number of images converted to grayscale together, default 8')
+    parser.add_argument('--keep_limit', type=float, default=None,
+                        help='statistic limit to accept the template at the last position without search, default None (off)')
     parser.add_argument('-d', '--debug', type=int, default=0,
                         help='display every nth frame with marked template position, default 0 (off)')
     parser.add_argument('--delay', type=float, default=1,
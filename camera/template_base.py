@@ -9,7 +9,87 @@ import json
 import yaml
 import matplotlib.pyplot as plt
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 import cv2
+try:
+    from numba import njit, prange
+except ModuleNotFoundError:
+    njit = None
+try:
+    from scipy.signal import fftconvolve
+except ModuleNotFoundError:
+    fftconvolve = None
+
+def ssd_numpy(img, templ, mem=64 * 1024 * 1024):
+    """ sum of squared differences of templ at each position of img
+
+        :param img: grayscale image (numpy array of uint8)
+        :param templ: grayscale template (numpy array of uint8)
+        :param mem: memory for differences in bytes, rows of positions are
+            processed in blocks fitting into it, default 64 MB
+        :returns: array of statistics, shape is the valid positions of templ
+    """
+    t = templ.astype(np.int16)
+    w = sliding_window_view(img, templ.shape)
+    ssd = np.empty(w.shape[:2], dtype=np.int64)
+    # differences are int16, at least one row in a block
+    block = max(1, mem // (2 * templ.size * w.shape[1]))
+    for i in range(0, w.shape[0], block):
+        diff = w[i:i+block].astype(np.int16)
+        diff -= t
+        # sum in int64, int32 overflows for large templates
+        ssd[i:i+block] = np.einsum('ijkl,ijkl->ij', diff, diff,
+                                   dtype=np.int64)
+    return ssd
+
+if njit is not None:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _ssd_scan(img, templ, out):
+        """ sum of squared differences of templ at each position of img,
+            compiled by numba, rows of out are processed in parallel
+
+            :param img: grayscale image (numpy array of uint8)
+            :param templ: grayscale template (numpy array of uint8)
+            :param out: array to store statistics (numpy array of int64)
+        """
+        th, tw = templ.shape
+        for i in prange(out.shape[0]):
+            for j in range(out.shape[1]):
+                s = 0
+                for a in range(th):
+                    for b in range(tw):
+                        d = int(img[i+a, j+b]) - int(templ[a, b])
+                        s += d * d
+                out[i, j] = s
+
+def ssd_numba(img, templ):
+    """ sum of squared differences of templ at each position of img
+
+        :param img: grayscale image (numpy array of uint8)
+        :param templ: grayscale template (numpy array of uint8)
+        :returns: array of statistics, shape is the valid positions of templ
+    """
+    out = np.empty((img.shape[0] - templ.shape[0] + 1,
+                    img.shape[1] - templ.shape[1] + 1), dtype=np.int64)
+    _ssd_scan(img, templ, out)
+    return out
+
+def ssd_fft(img, templ):
+    """ sum of squared differences of templ at each position of img,
+        using sum(t^2) + sum(w^2) - 2 * sum(t * w), sum(w^2) is taken from
+        the integral image of img^2, sum(t * w) is calculated by FFT
+
+        :param img: grayscale image (numpy array of uint8)
+        :param templ: grayscale template (numpy array of uint8)
+        :returns: array of statistics, shape is the valid positions of templ
+    """
+    th, tw = templ.shape
+    sum_t2 = float(np.square(templ.astype(np.float64)).sum())
+    _, sat = cv2.integral2(img, sdepth=cv2.CV_64F, sqdepth=cv2.CV_64F)
+    sum_w2 = sat[th:, tw:] - sat[:-th, tw:] - sat[th:, :-tw] + sat[:-th, :-tw]
+    xcorr = fftconvolve(img.astype(np.float64),
+                        templ[::-1, ::-1].astype(np.float64), mode='valid')
+    return sum_t2 + sum_w2 - 2 * xcorr
 
 class TemplateBase():
     """
@@ -45,8 +125,45 @@ class TemplateBase():
             self.method = self.methods[args.method]
         elif args.method == 99:
             self.spec = True
+        self.ssd_impl = 'opencv'
+        try:
+            self.ssd_impl = args.ssd_impl
+        except Exception:
+            pass
+        if self.ssd_impl == 'numba' and njit is None:
+            print("numba not installed, using numpy")
+            self.ssd_impl = 'numpy'
+        if self.ssd_impl == 'fft' and fftconvolve is None:
+            print("scipy not installed, using numpy")
+            self.ssd_impl = 'numpy'
+        self.gray_channel = False
+        try:
+            self.gray_channel = args.gray_channel
+        except Exception:
+            pass
+        self.pyramid = 0
+        try:
+            self.pyramid = args.pyramid
+        except Exception:
+            pass
+        self.templ_pyr = self.build_pyramid(self.templ)
         self.fast = args.fast
+        self.roi_radius = None
+        self.lost_limit = None
+        try:
+            self.roi_radius = args.roi_radius
+            self.lost_limit = args.lost_limit
+        except Exception:
+            pass
+        self.keep_limit = None
+        try:
+            self.keep_limit = args.keep_limit
+        except Exception:
+            pass
         self.debug = args.debug
+        # figure, axes, image and marker to show debug frames
+        self.debug_fig = self.debug_ax = None
+        self.debug_img = self.debug_marker = None
         if args.delay < 0.001:
             self.delay = 0.001
         else:
@@ -68,95 +185,250 @@ class TemplateBase():
                 self.cal_w, self.cal_h = c['img_size']
         else:
             self.mtx = self.dist = None
+        # undistort maps, calculated from the first frame
+        self.newmtx = self.map1 = self.map2 = self.map_size = None
 
     def img_correlation(self, img):
         """ find most similar part to templ on img
         img must be larger than templ in both dimensions
         img   - grayscale image to seek for templ (numpy array of uint8)
 
+        returns upper left corner of templ in img and statistic
+        """
+        if self.demo:
+            return self._img_correlation_demo(img)
+        if self.ssd_impl in ('numpy', 'numba', 'fft'):
+            if self.ssd_impl == 'fft' and self.templ.size > 256:
+                # FFT is slower than direct scan for small templates
+                ssd = ssd_fft(img, self.templ)
+            elif self.ssd_impl == 'numba':
+                ssd = ssd_numba(img, self.templ)
+            else:
+                ssd = ssd_numpy(img, self.templ)
+            row, col = np.unravel_index(np.argmin(ssd), ssd.shape)
+            return (col, row, ssd[row, col])
+        # sum of squared differences, same statistic as the reference loop
+        result = cv2.matchTemplate(img, self.templ, cv2.TM_SQDIFF)
+        min_val, _, min_loc, _ = cv2.minMaxLoc(result)
+        return (min_loc[0], min_loc[1], min_val)
+
+    def _img_correlation_demo(self, img):
+        """ reference implementation of img_correlation, it saves
+        partial results to tmp folder for demonstration
+        img   - grayscale image to seek for templ (numpy array of uint8)
+
         returns upper left corner of templ in img and statistic
         """
         rows, cols = img.shape
         trows, tcols = self.templ.shape
         row = col = None
         mins = trows * tcols * 255**2       # max statistic
-        t = self.templ.astype(int)
-        if self.demo:
-            mx = mins                         # extra for demonstration
-            res = np.zeros(shape=(rows, cols), dtype=np.uint8)  # extra for demonstration
-            res.fill(255)
+        t = self.templ.astype(np.int16)   # enough for differences of uint8
+        mx = mins                         # extra for demonstration
+        res = np.zeros(shape=(rows, cols), dtype=np.uint8)  # extra for demonstration
+        res.fill(255)
+        tmp = img.copy()
+        fig, (ax1, ax2) = plt.subplots(1, 2)
+        im1 = ax1.imshow(tmp, cmap='gray', vmin=0, vmax=255)
+        im2 = ax2.imshow(res, cmap='gray', vmin=0, vmax=255)
         for i in range(rows - trows):
             i1 = i + trows
             for j in range(cols - tcols):
                 j1 = j + tcols
-                s = np.sum(np.square(t - img[i:i1, j:j1]))
+                diff = np.subtract(t, img[i:i1, j:j1], dtype=np.int16).ravel()
+                # sum of squares in int64 to avoid overflow
+                s = int(np.einsum('i,i->', diff, diff, dtype=np.int64))
                 if s < mins:
                     mins = s
                     row = i
                     col = j
-                if self.demo:
-                    # extra for demonstating
-                    tmp = img.copy()
+                # extra for demonstating
+                res[i, j] = int(s / mx * 1000)
+                if i % 20 == 0 and j % 20 == 0:
+                    tmp[:] = img
                     tmp[i:i1, j:j1] = self.templ
-                    res[i, j] = int(s / mx * 1000)
-                    fig = plt.figure()
-                    fig.add_subplot(1, 2, 1)
-                    plt.imshow(tmp, cmap='gray', vmin=0, vmax=255)
-                    fig.add_subplot(1, 2, 2)
-                    plt.imshow(res, cmap='gray', vmin=0, vmax=255)
-                    #plt.show()
-                    if i % 20 == 0 and j % 20 == 0:
-                        name = f"tmp/{i:04d}{j:04d}.png"
-                        plt.savefig(name)
-                    plt.close(fig)
-                    # end extra for demonstating
-        if self.demo:
-            print(np.min(res), np.max(res))
-        return (col, row, s)
+                    im1.set_data(tmp)
+                    im2.set_data(res)
+                    fig.canvas.draw_idle()
+                    name = f"tmp/{i:04d}{j:04d}.png"
+                    fig.savefig(name)
+                # end extra for demonstating
+        plt.close(fig)
+        print(np.min(res), np.max(res))
+        return (col, row, mins)
+
+    def build_pyramid(self, img):
+        """ create Gaussian pyramid of image
+
+            :param img: image to downsample
+            :returns: list of images, original image is the first one
+        """
+        pyr = [img]
+        for _ in range(self.pyramid):
+            pyr.append(cv2.pyrDown(pyr[-1]))
+        return pyr
+
+    def match(self, img, templ):
+        """ find template on image using OpenCV
+
+            :param img: grayscale image to seek for templ
+            :param templ: grayscale template image
+            :returns: upper left corner of templ in img and statistic
+        """
+        result = cv2.matchTemplate(img, templ, self.method[0])
+        min_max = cv2.minMaxLoc(result)
+        x = min_max[self.method[1]][0]
+        y = min_max[self.method[1]][1]
+        s = min_max[self.method[1]-2]   #result[x, y]
+        return (x, y, s)
+
+    def pyramid_match(self, img):
+        """ find template on the top level of the Gaussian pyramid and
+            refine position on the full resolution image around it
+
+            :param img: grayscale image to seek for templ
+            :returns: upper left corner of templ in img and statistic
+        """
+        templ = self.templ_pyr[-1]
+        small = self.build_pyramid(img)[-1]
+        if min(templ.shape) < 4 or small.shape[0] < templ.shape[0] or \
+           small.shape[1] < templ.shape[1]:
+            # too small for pyramid
+            return self.match(img, self.templ)
+        x, y, _ = self.match(small, templ)
+        scale = 2 ** self.pyramid
+        d = 2 * scale   # search range around scaled position
+        x0 = max(0, x * scale - d)
+        y0 = max(0, y * scale - d)
+        x1 = min(img.shape[1], x * scale + self.templ_w + d)
+        y1 = min(img.shape[0], y * scale + self.templ_h + d)
+        x, y, s = self.match(img[y0:y1, x0:x1], self.templ)
+        return (x + x0, y + y0, s)
 
-    def ProcessImg(self, frame, i):
+    def check_last(self, img):
+        """ compare template to the image at the last position only
+
+            :param img: grayscale image, part of the frame from offset
+            :returns: upper left corner of templ in img and statistic or None if statistic is worse than keep_limit
+        """
+        x = self.last_x - self.off_x
+        y = self.last_y - self.off_y
+        patch = img[y:y+self.templ_h, x:x+self.templ_w]
+        if x < 0 or y < 0 or patch.shape != self.templ.shape:
+            return None
+        s = cv2.matchTemplate(patch, self.templ, self.method[0])[0, 0]
+        if self.method[1] == self.minv:
+            ok = s <= self.keep_limit
+        else:
+            ok = s >= self.keep_limit
+        if ok:
+            return (x, y, s)
+        return None
+
+    def to_gray(self, frame, dst=None):
+        """ convert image to grayscale
+
+            :param frame: image to convert
+            :param dst: preallocated target array, same size as frame,
+                default None
+            :returns: grayscale image, dst if it is given
+        """
+        if frame.ndim == 2:
+            gray = frame    # already grayscale
+        elif self.gray_channel:
+            gray = frame[:, :, 1]   # green channel, no copy
+        else:
+            return cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY, dst=dst)
+        if dst is None:
+            return gray
+        np.copyto(dst, gray)
+        return dst
+
+    def ProcessImg(self, frame, i, gray=None):
         """ process single image
 
             :param frame: image to process
             :param i: frame id
+            :param gray: grayscale version of frame converted by to_gray,
+                default None, converted here
             :returns: dictionary of match position
         """
         if self.calibration:    # undistort image using calibration
             h, w = frame.shape[:2]
-            if (self.cal_w, self.cal_h) == (w, h):
-                newmtx = self.mtx
-            else:
-                newmtx, roi = cv2.getOptimalNewCameraMatrix(self.mtx, self.dist,
-                                                            (w, h), 1, (w, h))
-            frame = cv2.undistort(frame, self.mtx, self.dist, None, newmtx)
-        img_gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        if self.fast and self.last_x:
-            self.off_x = max(0, self.last_x - self.templ_w // 2)
-            self.off_y = max(0, self.last_y - self.templ_h // 2)
-            self.off_x1 = min(self.last_x + 3 * self.templ_w // 2,
+            if self.map_size != (w, h):
+                # build undistort maps for the first frame or size change
+                if (self.cal_w, self.cal_h) == (w, h):
+                    self.newmtx = self.mtx
+                else:
+                    self.newmtx, roi = cv2.getOptimalNewCameraMatrix(self.mtx,
+                        self.dist, (w, h), 1, (w, h))
+                self.map1, self.map2 = cv2.initUndistortRectifyMap(self.mtx,
+                    self.dist, None, self.newmtx, (w, h), cv2.CV_16SC2)
+                self.map_size = (w, h)
+            frame = cv2.remap(frame, self.map1, self.map2, cv2.INTER_LINEAR)
+            if gray is not None:
+                gray = cv2.remap(gray, self.map1, self.map2, cv2.INTER_LINEAR)
+        img_gray = self.to_gray(frame) if gray is None else gray
+        if self.fast and self.last_x is not None:
+            r_x = self.roi_radius if self.roi_radius else self.templ_w // 2
+            r_y = self.roi_radius if self.roi_radius else self.templ_h // 2
+            self.off_x = max(0, self.last_x - r_x)
+            self.off_y = max(0, self.last_y - r_y)
+            self.off_x1 = min(self.last_x + self.templ_w + r_x,
                               img_gray.shape[1])
-            self.off_y1 = min(self.last_y + 3 * self.templ_h // 2,
+            self.off_y1 = min(self.last_y + self.templ_h + r_y,
                               img_gray.shape[0])
             img_gray = img_gray[self.off_y:self.off_y1, self.off_x:self.off_x1]
-        if self.spec:
+        else:
+            self.off_x = self.off_y = 0
+        pos = None
+        if self.keep_limit is not None and not self.spec and \
+           self.last_x is not None:
+            pos = self.check_last(img_gray)
+        if pos is not None:
+            x, y, s = pos   # template at the same position
+        elif self.spec:
             x, y, s = self.img_correlation(img_gray)
+        elif self.pyramid:
+            x, y, s = self.pyramid_match(img_gray)
         else:
-            result = cv2.matchTemplate(img_gray, self.templ, self.method[0])
-            min_max = cv2.minMaxLoc(result)
-            x = min_max[self.method[1]][0]
-            y = min_max[self.method[1]][1]
-            s = min_max[self.method[1]-2]   #result[x, y]
+            x, y, s = self.match(img_gray, self.templ)
         if self.debug and i % self.debug == 0:
-            plt.clf()
-            plt.imshow(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
-            plt.plot(x+self.off_x, y+self.off_y, "or")
+            if frame.ndim == 2:
+                img_rgb = frame
+            else:
+                img_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            if self.debug_img is None or \
+               self.debug_img.get_array().shape != img_rgb.shape:
+                # create image and marker for the first frame only
+                if self.debug_fig is None:
+                    self.debug_fig, self.debug_ax = plt.subplots()
+                self.debug_ax.clear()
+                self.debug_img = self.debug_ax.imshow(img_rgb, cmap='gray',
+                                                      vmin=0, vmax=255)
+                self.debug_marker, = self.debug_ax.plot([], [], "or")
+            else:
+                self.debug_img.set_data(img_rgb)
+            self.debug_marker.set_data([x+self.off_x], [y+self.off_y])
+            self.debug_fig.canvas.draw_idle()
             plt.pause(self.delay)
         if self.refresh_template:
             # get template from last image
-            self.templ = img_gray[y:y+self.templ_h, x:x+self.templ_w]
+            self.templ = img_gray[y:y+self.templ_h, x:x+self.templ_w].copy()
+            if self.pyramid:
+                self.templ_pyr = self.build_pyramid(self.templ)
         self.last_x = x + self.off_x
         self.last_y = y + self.off_y
-        return {'east': self.last_x, 'north': self.last_y, 'quality': s}
+        res = {'east': self.last_x, 'north': self.last_y, 'quality': s}
+        if self.fast and self.lost_limit is not None:
+            if self.spec or self.method[1] == self.minv:
+                lost = s > self.lost_limit
+            else:
+                lost = s < self.lost_limit
+            if lost:
+                # target lost, search on the whole image next time
+                self.last_x = self.last_y = None
+        return res
 
 if __name__ == "__main__":
     import argparse
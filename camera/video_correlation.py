@@ -105,10 +105,23 @@ if __name__ == "__main__":
                         help='frame per sec')
     parser.add_argument('-m', '--method', type=int, default=5,
                         help='method to compare video frame and template, 0/1/2/3/4/5 TM_SQDIFF/TM_SQDIFF_NORMED/TM_CCORR/TM_CCORR_NORMED/CV_TM_CCOEFF/CV_TM_CCOEFF_NORMED, default 5')
+    parser.add_argument('--ssd_impl', type=str, default='opencv',
+                        choices=['opencv', 'numpy', 'numba', 'fft'],
+                        help='implementation of sum of squared differences for method 99, default opencv')
     parser.add_argument('-r', '--refresh_template', action="store_true",
                         help='refresh template after each frames')
+    parser.add_argument('--gray_channel', action="store_true",
+                        help='use green channel of color images instead of grayscale conversion')
+    parser.add_argument('--pyramid', type=int, default=0,
+                        help='number of pyramid levels for coarse search, the position is refined on the full resolution image, default 0 (off)')
     parser.add_argument('--fast', action="store_true",
                         help='reduce input image size to double the template')
+    parser.add_argument('--roi_radius', type=int, default=None,
+                        help='search range around the last position in pixels with --fast, default half of the template size')
+    parser.add_argument('--lost_limit', type=float, default=None,
+                        help='statistic limit for lost target with --fast, the next frame is searched entirely, default None (off)')
+    parser.add_argument('--keep_limit', type=float, default=None,
+                        help='statistic limit to accept the template at the last position without search, default None (off)')
     parser.add_argument('-d', '--debug', type=int, default=0,
                         help='display every nth frame with marked template position, default 0 (off)')
     parser.add_argument('--delay', type=float, default=0.01,
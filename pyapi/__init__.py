@@ -5,6 +5,11 @@ import re
 from enum import Enum, auto
 from typing import TypeAlias, Literal
 
+try:
+    from . import _angle_c
+except ImportError:
+    _angle_c = None
+
 
 __all__ = [
     'RO',
@@ -20,6 +25,8 @@ RO = 180 * 60 * 60 / math.pi
 PI2 = 2 * math.pi
 """Full angle in RAD"""
 
+_DMS_RE = re.compile(r"^[0-9]{1,3}(-[0-9]{1,2}){0,2}$")
+
 
 class AngleUnit(Enum):
     RAD = auto()
@@ -49,8 +56,13 @@ class AngleUnit(Enum):
 
 _AngleUnitLike: TypeAlias = AngleUnit | Literal['RAD', 'DEG', 'PDEG', 'GON', 'MIL', 'SEC', 'DMS', 'NMEA']
 
+_UNIT_BY_NAME = {u.name: u for u in AngleUnit}
+"""Angle units by name, plain dictionary lookup instead of AngleUnit[name]"""
+
 
 class Angle:
+    __slots__ = ('_value',)
+
     @staticmethod
     def deg2rad(angle: float) -> float:
         """Converts degrees to radians.
@@ -67,17 +79,15 @@ class Angle:
     def dms2rad(dms: str) -> float:
         """Converts DDD-MM-SS to radians.
         """
-        if not re.search(r"^[0-9]{1,3}(-[0-9]{1,2}){0,2}$", dms):
+        if not _DMS_RE.match(dms):
             raise ValueError("Angle invalid argument", dms)
 
-        items = [float(item) for item in dms.split("-")]
-        div = 1
-        a = 0.0
-        for val in items:
-            a += val / div
-            div *= 60
+        parts = dms.split("-")
+        d = float(parts[0])
+        m = float(parts[1]) if len(parts) > 1 else 0.0
+        s = float(parts[2]) if len(parts) > 2 else 0.0
 
-        return math.radians(a)
+        return math.radians(d + m / 60 + s / 3600)
 
     @staticmethod
     def dm2rad(angle: float) -> float:
@@ -128,15 +138,12 @@ class Angle:
         return math.degrees(angle)
 
     @staticmethod
-    def rad2dms(angle: float) -> str:
+    def rad2dms(angle: float, _RO: float = RO) -> str:
         """Converts radians to DDD-MM-SS.
         """
-        signum = "-" if angle < 0 else ""
-        secs = round(abs(angle) * RO)
+        deg, secs = divmod(round(abs(angle) * _RO), 3600)
         mi, sec = divmod(secs, 60)
-        deg, mi = divmod(mi, 60)
-        deg = int(deg)
-        return f"{signum:s}{deg:d}-{mi:02d}-{sec:02d}"
+        return "%s%d-%02d-%02d" % ("-" if angle < 0 else "", deg, mi, sec)
 
     @staticmethod
     def rad2dm(angle: float) -> float:
@@ -163,47 +170,69 @@ class Angle:
         return angle / math.pi / 2 * 6400
 
     @staticmethod
-    def normalize_rad(angle: float, positive: float = False) -> float:
-        """Normalizes angle to [+2PI; -2PI] range.
+    def normalize_rad(angle: float, positive: bool = False) -> float:
+        """Normalizes angle to (-2PI; +2PI) range keeping the sign,
+        or to [0; 2PI) range if positive.
         """
-        norm = angle % PI2
-
-        if not positive and angle < 0:
-            norm -= PI2
-
-        return norm
+        norm = math.fmod(angle, PI2)
+
+        if positive and norm < 0:
+            norm += PI2
+
+        return norm + 0.0  # no negative zero
+
+    _NUMBER = (float, int)
+
+    _TO_RAD = {
+        AngleUnit.RAD: (lambda value: value, _NUMBER),
+        AngleUnit.DEG: (deg2rad, _NUMBER),
+        AngleUnit.PDEG: (pdeg2rad, _NUMBER),
+        AngleUnit.GON: (gon2rad, _NUMBER),
+        AngleUnit.MIL: (mil2rad, _NUMBER),
+        AngleUnit.SEC: (sec2rad, _NUMBER),
+        AngleUnit.DMS: (dms2rad, (str,)),
+        AngleUnit.NMEA: (dm2rad, _NUMBER)
+    }
+    """Converters to radians and accepted value types by source unit"""
+
+    _FROM_RAD = {
+        AngleUnit.RAD: lambda angle: angle,
+        AngleUnit.DEG: rad2deg,
+        AngleUnit.PDEG: rad2pdeg,
+        AngleUnit.GON: rad2gon,
+        AngleUnit.MIL: rad2mil,
+        AngleUnit.SEC: rad2sec,
+        AngleUnit.DMS: rad2dms,
+        AngleUnit.NMEA: rad2dm
+    }
+    """Converters from radians by target unit"""
 
     def __init__(self, value: float | str, unit: _AngleUnitLike = AngleUnit.RAD, /, normalize: bool = False, positive: bool = False):
         self._value: float = 0
         if type(unit) is str:
-            try:
-                unit = AngleUnit[unit]
-            except KeyError as e:
-                raise ValueError(f"unknown source unit: {unit}") from e
-
-        match unit, value:
-            case AngleUnit.RAD, float() | int():
-                self._value = value
-            case AngleUnit.DEG, float() | int():
-                self._value = self.deg2rad(value)
-            case AngleUnit.PDEG, float() | int():
-                self._value = self.pdeg2rad(value)
-            case AngleUnit.GON, float() | int():
-                self._value = self.gon2rad(value)
-            case AngleUnit.MIL, float() | int():
-                self._value = self.mil2rad(value)
-            case AngleUnit.SEC, float() | int():
-                self._value = self.sec2rad(value)
-            case AngleUnit.DMS, str():
-                self._value = self.dms2rad(value)
-            case AngleUnit.NMEA, float() | int():
-                self._value = self.dm2rad(value)
-            case _:
-                raise ValueError(f"unknown source unit and value type pair: {unit} - {type(value).__name__}")
+            name = unit
+            unit = _UNIT_BY_NAME.get(name)
+            if unit is None:
+                raise ValueError(f"unknown source unit: {name}")
+
+        conv, types = self._TO_RAD.get(unit, (None, ()))
+        if not isinstance(value, types):
+            raise ValueError(f"unknown source unit and value type pair: {unit} - {type(value).__name__}")
+
+        self._value = conv(value)
 
         if normalize:
             self._value = self.normalize_rad(self._value, positive)
 
+    @classmethod
+    def _from_rad(cls, value: float) -> Angle:
+        """Creates an angle from a radian value without unit dispatch
+        and type check, for results of arithmetic on angles.
+        """
+        obj = cls.__new__(cls)
+        obj._value = value
+        return obj
+
     def __str__(self) -> str:
         return f"{self.asunit(AngleUnit.GON):.4f}"
 
@@ -211,16 +240,16 @@ class Angle:
         return f"({type(self).__name__:s}{self._value:f})"
 
     def __pos__(self) -> Angle:
-        return Angle(self._value)
+        return Angle._from_rad(self._value)
 
     def __neg__(self) -> Angle:
-        return Angle(-self._value)
+        return Angle._from_rad(-self._value)
 
     def __add__(self, other: Angle) -> Angle:
         if type(other) is not Angle:
             raise TypeError(f"unsupported operand type(s) for +: 'Angle' and '{type(other).__name__}'")
 
-        return Angle(self._value + other._value)
+        return Angle._from_rad(self._value + other._value)
 
     def __iadd__(self, other: Angle) -> Angle:
         if type(other) is not Angle:
@@ -233,7 +262,7 @@ class Angle:
         if type(other) is not Angle:
             raise TypeError(f"unsupported operand type(s) for -: 'Angle' and '{type(other).__name__}'")
 
-        return Angle(self._value - other._value)
+        return Angle._from_rad(self._value - other._value)
 
     def __isub__(self, other: Angle) -> Angle:
         if type(other) is not Angle:
@@ -246,7 +275,7 @@ class Angle:
         if type(other) not in (int, float):
             raise TypeError(f"unsupported operand type(s) for *: 'Angle' and '{type(other).__name__}'")
 
-        return Angle(self._value * other)
+        return Angle._from_rad(self._value * other)
 
     def __imul__(self, other: int | float) -> Angle:
         if type(other) not in (int, float):
@@ -259,7 +288,7 @@ class Angle:
         if type(other) not in (int, float):
             raise TypeError(f"unsupported operand type(s) for /: 'Angle' and '{type(other).__name__}'")
 
-        return Angle(self._value / other)
+        return Angle._from_rad(self._value / other)
 
     def __itruediv__(self, other: int | float) -> Angle:
         if type(other) not in (int, float):
@@ -275,32 +304,31 @@ class Angle:
         """Returns the value of the angle in the target unit.
         """
         if type(unit) is str:
-            try:
-                unit = AngleUnit[unit]
-            except KeyError as e:
-                raise ValueError(f"unknown target unit: {unit}") from e
-
-        match unit:
-            case AngleUnit.RAD:
-                return self._value
-            case AngleUnit.DEG:
-                return self.rad2deg(self._value)
-            case AngleUnit.PDEG:
-                return self.rad2pdeg(self._value)
-            case AngleUnit.GON:
-                return self.rad2gon(self._value)
-            case AngleUnit.MIL:
-                return self.rad2mil(self._value)
-            case AngleUnit.SEC:
-                return self.rad2sec(self._value)
-            case AngleUnit.DMS:
-                return self.rad2dms(self._value)
-            case AngleUnit.NMEA:
-                return self.rad2dm(self._value)
-            case _:
-                raise ValueError(f"unknown target unit: {unit}")
+            name = unit
+            unit = _UNIT_BY_NAME.get(name)
+            if unit is None:
+                raise ValueError(f"unknown target unit: {name}")
+
+        conv = self._FROM_RAD.get(unit)
+        if conv is None:
+            raise ValueError(f"unknown target unit: {unit}")
+
+        return conv(self._value)
 
     def normalized(self, positive: bool = True) -> Angle:
         """Returns a copy of the angle normalized to full angle.
         """
-        return Angle(self._value, AngleUnit.RAD, True, positive)
+        return Angle._from_rad(self.normalize_rad(self._value, positive))
+
+
+if _angle_c is not None:
+    # replace conversions with the compiled ones, see _angle_c.pyx
+    _COMPILED = {name: getattr(_angle_c, name) for name in (
+        'deg2rad', 'gon2rad', 'dm2rad', 'sec2rad', 'mil2rad',
+        'rad2gon', 'rad2sec', 'rad2deg', 'rad2dm', 'rad2mil')}
+    for _name, _func in _COMPILED.items():
+        setattr(Angle, _name, staticmethod(_func))
+    Angle._TO_RAD = {unit: (_COMPILED.get(getattr(conv, '__name__', None), conv), types)
+                     for unit, (conv, types) in Angle._TO_RAD.items()}
+    Angle._FROM_RAD = {unit: _COMPILED.get(getattr(conv, '__name__', None), conv)
+                       for unit, conv in Angle._FROM_RAD.items()}
@@ -0,0 +1,73 @@
+# cython: language_level=3, cdivision=True
+"""Compiled angle unit conversions for Angle, same formulas as the static
+methods of Angle. Conversions using Python rounding (PDEG, DMS) are not
+included. Build in place by python setup.py build_ext --inplace.
+"""
+from libc.math cimport trunc
+
+cdef double PI = 3.141592653589793
+cdef double RO = 180 * 60 * 60 / PI
+
+
+cpdef double deg2rad(double angle):
+    """Converts degrees to radians.
+    """
+    return angle * (PI / 180.0)
+
+
+cpdef double gon2rad(double angle):
+    """Converts gradians to radians.
+    """
+    return angle / 200 * PI
+
+
+cpdef double dm2rad(double angle):
+    """Converts DDDMM.NNNNNN NMEA angle to radians.
+    """
+    cdef double w = angle / 100
+    cdef double d = trunc(w)
+    return (d + (w - d) * 100 / 60) * (PI / 180.0)
+
+
+cpdef double sec2rad(double angle):
+    """Converts arcseconds to radians.
+    """
+    return angle / RO
+
+
+cpdef double mil2rad(double angle):
+    """Converts NATO mils to radians.
+    """
+    return angle / 6400 * 2 * PI
+
+
+cpdef double rad2gon(double angle):
+    """Converts radians to gradians.
+    """
+    return angle / PI * 200
+
+
+cpdef double rad2sec(double angle):
+    """Converts radians to arcseconds.
+    """
+    return angle * RO
+
+
+cpdef double rad2deg(double angle):
+    """Converts radians to degrees.
+    """
+    return angle * (180.0 / PI)
+
+
+cpdef double rad2dm(double angle):
+    """Converts radians to NMEA DDDMM.NNNNNNN.
+    """
+    cdef double w = angle / PI * 180.0
+    cdef double d = trunc(w)
+    return d * 100 + (w - d) * 60
+
+
+cpdef double rad2mil(double angle):
+    """Converts radian to NATO mils.
+    """
+    return angle / PI / 2 * 6400
@@ -17,6 +17,7 @@ import re
 
 RO = 180 * 60 * 60 / math.pi
 PI2 = 2 * math.pi
+DMS_RE = re.compile('^[0-9]{1,3}(-[0-9]{1,2}){0,2}$')
 
 def _deg2rad(angle):
     """ Convert DEG to RAD
@@ -29,19 +30,15 @@ def _gon2rad(angle):
     return angle / 200.0 * math.pi
 
 def _dms2rad(dms):
-    """ Convert DMS to RAD
+    """ Convert DMS to RAD, ValueError is raised for invalid DMS string
     """
-    if re.search('^[0-9]{1,3}(-[0-9]{1,2}){0,2}$', dms):
-        items = [float(item) for item in dms.split('-')]
-        div = 1.0
-        a = 0.0
-        for val in items:
-            a += val / div
-            div *= 60.0
-        a = math.radians(a)
-    else:
+    if not DMS_RE.match(dms):
         raise ValueError("Angle invalid argument", dms)
-    return a
+    parts = dms.split('-')
+    d = float(parts[0])
+    m = float(parts[1]) if len(parts) > 1 else 0.0
+    s = float(parts[2]) if len(parts) > 2 else 0.0
+    return math.radians(d + m / 60.0 + s / 3600.0)
 
 def _dm2rad(angle):
     """ Convert DDMM.nnnnnn NMEA angle to radian"
@@ -87,12 +84,9 @@ def _rad2deg(value):
 def _dms(value):
     """ Convert radian to DMS
     """
-    signum = "-" if value < 0 else ""
-    secs = round(_rad2sec(abs(value)))
+    deg, secs = divmod(round(abs(value) * RO), 3600)
     mi, sec = divmod(secs, 60)
-    deg, mi = divmod(mi, 60)
-    deg = int(deg)
-    return f"{signum}{deg}-{mi:02d}-{sec:02d}"
+    return "%s%d-%02d-%02d" % ("-" if value < 0 else "", deg, mi, sec)
 
 def _rad2dm(value):
     """ Convert radian to NMEA DDDMM.nnnnn
@@ -139,6 +133,8 @@ class Angle():
         :param unit: angle unit (available units RAD/DMS/DEG/GON/NMEA/PDEG/SEC/MIL)
     """
 
+    __slots__ = ('value',)
+
     # jump table to import from
     im = {'DMS': _dms2rad, 'DEG': _deg2rad,
           'GON': _gon2rad, 'NMEA': _dm2rad,
@@ -267,6 +263,12 @@ if __name__ == "__main__":
     print(a2.Normalize().GetAngle('DMS'))
     for u in ['RAD', 'DMS', 'GON', 'NMEA', 'DEG', 'PDEG', 'MIL']:
         print(a1.GetAngle(u))
+    for dms in ['12.5-30', '1-2-3-4', '-12-30', '12-30-']:
+        try:
+            Angle(dms, 'DMS')
+            print(dms, 'accepted')
+        except ValueError:
+            print(dms, 'rejected')
     b1 = Angle(1.1111, 'PDEG')
     print(b1.GetAngle("DMS"))
     c1 = a1 + b1
@@ -0,0 +1,167 @@
+#!/usr/bin/env python
+"""
+.. module:: asynctotalstation.py
+   :platform: Unix, Windows
+   :synopsis: Ulyxes - an open source project to drive total stations and
+       publish observation results.  GPL v2.0 license Copyright (C)
+       2010- Zoltan Siki <siki.zoltan@epito.bme.hu>
+
+.. moduleauthor:: Zoltan Siki <siki.zoltan@epito.bme.hu>
+"""
+import logging
+import queue
+import threading
+from concurrent.futures import Future
+from totalstation import TotalStation
+
+class AsyncTotalStation(TotalStation):
+    """ Total station with pipelined messages. A writer thread sends
+        the queued messages back to back, a reader thread reads the
+        answers in the same order and resolves the futures of requests.
+        The synchronous methods of TotalStation wait for their own answer.
+
+            :param name: name of instrument
+            :param measureUnit: measure unit part of instrument
+            :param measureIface: interface to physical unit, it should have
+                PutLine and GetLine (e.g. SerialIface), else messages
+                are sent one by one
+            :param writerUnit: store data, default None
+            :param depth: maximal number of messages waiting for answer,
+                default 4
+    """
+    def __init__(self, name, measureUnit, measureIface, writerUnit=None,
+                 depth=4):
+        """ Constructor
+        """
+        super().__init__(name, measureUnit, measureIface, writerUnit)
+        self._pipelined = hasattr(measureIface, 'PutLine') and \
+            hasattr(measureIface, 'GetLine')
+        self._submitted = queue.Queue()
+        self._pending = queue.Queue(maxsize=depth)
+        self._writer = threading.Thread(target=self._write_loop, daemon=True)
+        self._reader = threading.Thread(target=self._read_loop, daemon=True)
+        self._writer.start()
+        self._reader.start()
+
+    def _write_loop(self):
+        """ Send submitted messages without waiting for answers
+        """
+        while True:
+            item = self._submitted.get()
+            if item is None:
+                self._pending.put(None)
+                break
+            msg, fut = item
+            if not fut.set_running_or_notify_cancel():
+                continue
+            if self._pipelined:
+                parts = msg.split('|')
+                sent = 0
+                for m in parts:
+                    if self.measureIface.PutLine(m) != 0:
+                        break
+                    sent += 1
+                self._pending.put((msg, sent, None, fut))
+            else:
+                ans = self.measureIface.Send(msg)
+                self._pending.put((msg, 0, ans, fut))
+
+    def _read_loop(self):
+        """ Read answers in the order of messages sent and resolve futures
+        """
+        while True:
+            item = self._pending.get()
+            if item is None:
+                break
+            msg, sent, ans, fut = item
+            try:
+                if self._pipelined:
+                    anss = [self.measureIface.GetLine() for _ in range(sent)]
+                    ans = '|'.join(a for a in anss if a is not None)
+                fut.set_result(self._result(msg, ans))
+            except Exception as e:
+                logging.error(" processing answer failed: %s", e)
+                fut.set_exception(e)
+
+    def _result(self, msg, ans):
+        """ Parse answer and store data
+
+            :param msg: message sent
+            :param ans: answer got from instrument
+            :returns: parsed answer (dictionary)
+        """
+        if self.measureIface.state != self.measureIface.IF_OK:
+            return {}
+        res = self.measureUnit.Result(msg, ans)
+        if self.writerUnit is not None and res is not None and len(res) > 0:
+            self.writerUnit.WriteData(res)
+        return res
+
+    def Submit(self, msg):
+        """ Queue a message to the instrument
+
+            :param msg: message to send, it can be multipart message
+                separated by '|'
+            :returns: future of the processed answer (Future)
+        """
+        self._last_angles = None    # message may move the telescope
+        return self._submit(msg)
+
+    def _submit(self, msg):
+        """ Queue a message to the instrument
+
+            :param msg: message to send
+            :returns: future of the processed answer (Future)
+        """
+        fut = Future()
+        self._submitted.put((msg, fut))
+        return fut
+
+    def Request(self, name, *args):
+        """ Queue a request by the name of the message builder of the
+            measure unit, e.g. ts.Request('GetAngles'), ts.Request('Coords')
+
+            :param name: name of the method without the Msg postfix
+            :param args: parameters to the message builder
+            :returns: future of the processed answer (Future)
+        """
+        msg = getattr(self.measureUnit, name + 'Msg')(*args)
+        return self.Submit(msg)
+
+    def _process(self, msg, pic=None):
+        """ Send message through the pipeline and wait for the answer,
+            in batch mode the message is only stored
+
+            :param msg: message to send
+            :param pic: not used, binary answers are not supported
+            :returns: parsed answer (dictionary), empty dictionary in batch mode
+        """
+        if self._batch is not None:
+            return super()._process(msg, pic)
+        res = self._submit(msg).result()
+        if self.measureIface.state != self.measureIface.IF_OK or \
+                'errorCode' in res:
+            # instrument may be in unknown state
+            self._last_angles = None
+        return res
+
+    def Close(self):
+        """ Stop the threads after the queued messages are processed
+        """
+        self._submitted.put(None)
+        self._writer.join()
+        self._reader.join()
+
+if __name__ == "__main__":
+    from serialiface import SerialIface
+    from leicatps1200 import LeicaTPS1200
+
+    logging.getLogger().setLevel(logging.DEBUG)
+    mu = LeicaTPS1200()
+    iface = SerialIface("rs-232", "/dev/ttyUSB0")
+    ts = AsyncTotalStation("Leica", mu, iface)
+    futs = [ts.Request('GetAngles'), ts.Request('Coords'),
+            ts.Request('GetInternalTemperature')]
+    for f in futs:
+        print(f.result())
+    ts.Close()
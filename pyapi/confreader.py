@@ -22,6 +22,20 @@ class ConfReader(JSONReader):
             :param pars: a dictionary for parameter validation e.g. {key : {}}, valid keys for individual config parameters are: required (True/False), type (int/float/str/list)
     """
 
+    # type validators and error messages for type names in pars,
+    # bool is a subclass of int but it is not accepted as a number
+    _VALIDATORS = {
+        'int': (lambda v: isinstance(v, int) and not isinstance(v, bool),
+                "type mismatch parameter: {par}"),
+        'float': (lambda v: isinstance(v, (int, float)) and
+                      not isinstance(v, bool),
+                  "type mismatch parameter: {par}"),
+        'list': (lambda v: isinstance(v, list),
+                 "type mismatch parameter: {par}"),
+        'file': (lambda v: not isinstance(v, str) or os.path.isfile(v),
+                 "parameter type mismatch or file does not exist: {val}")
+    }
+
     def __init__(self, name=None, fname=None, pars=None):
         """ Constructor
         """
@@ -52,25 +66,13 @@ class ConfReader(JSONReader):
                 # do not check type for None if it is the default
                 continue
             if 'type' in pardef:
-                if pardef['type'] == 'int' and type(self.json[par]) is not int:
-                    msg_lst.append(f"type mismatch parameter: {par}")
-                    return 'FATAL', msg_lst
-                if pardef['type'] == 'float' and \
-                    type(self.json[par]) is not int and \
-                    type(self.json[par]) is not float:
-                    msg_lst.append(f"type mismatch parameter: {par}")
-                    return 'FATAL', msg_lst
-                if pardef['type'] == 'list' and \
-                    type(self.json[par]) is not list:
-                    msg_lst.append(f"type mismatch parameter: {par}")
-                    return 'FATAL', msg_lst
-                if pardef['type'] == 'file' and \
-                    type(self.json[par]) is str and \
-                    not os.path.isfile(self.json[par]):
-                    msg_lst.append(f"parameter type mismatch or file does not exist: {self.json[par]}")
-                    return 'FATAL', msg_lst
+                if pardef['type'] in self._VALIDATORS:
+                    valid, msg = self._VALIDATORS[pardef['type']]
+                    if not valid(self.json[par]):
+                        msg_lst.append(msg.format(par=par, val=self.json[par]))
+                        return 'FATAL', msg_lst
                 if pardef['type'] == 'logfile' and \
-                    type(self.json[par]) is str and \
+                    isinstance(self.json[par], str) and \
                     not os.path.isfile(self.json[par]):
                     # create log file
                     try:
@@ -16,6 +16,7 @@ class Iface():
 
         :param name: name of the interface (str) (default None)
     """
+    __slots__ = ('name', 'state', 'opened')
 
     IF_OK = 0
     IF_EOF = -1
@@ -51,6 +51,8 @@ class Instrument():
             :param MeasureIface: interface to physical intrument (Iface)
             :param writerUnit: unit to save observed data (Writer), optional
     """
+    __slots__ = ('name', 'measureUnit', 'measureIface', 'writerUnit')
+
     def __init__(self, name, measureUnit, measureIface, writerUnit = None):
         """ constructor
         """
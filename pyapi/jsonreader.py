@@ -10,9 +10,21 @@
 
 .. moduleauthor:: Zoltan Siki <siki.zoltan@epito.bme.hu>
 """
+import os
+import copy
 import json
 from filereader import FileReader
 
+try:
+    import orjson
+except ModuleNotFoundError:
+    orjson = None
+
+# parsed JSON files by absolute path, values are (modification time, data),
+# least recently used files are dropped above _CACHE_SIZE
+_CACHE = {}
+_CACHE_SIZE = 32
+
 class JSONReader(FileReader):
     """ Class to read file
 
@@ -24,6 +36,7 @@ class JSONReader(FileReader):
         """ Constructor
         """
         super().__init__(name, fname)
+        self.fname = fname
         self.json = None
 
     def GetLine(self):
@@ -32,12 +45,30 @@ class JSONReader(FileReader):
         raise ValueError('GetLine not available for JSON reader')
 
     def Load(self):
-        """ Load full JSON file
+        """ Load full JSON file, the file is parsed again only if it was
+            changed since the last load, a deep copy of the cached data
+            is returned so it can be changed by the caller
+
+            :returns: loaded data
         """
-        #c = ""
-        #for line in self.fp:
-        #    c += line
-        res = json.loads("".join(self.fp.readlines()))
+        try:
+            path = os.path.abspath(self.fname)
+            mtime = os.stat(self.fname).st_mtime_ns
+        except (OSError, TypeError):
+            path = None
+        hit = _CACHE.pop(path, None)
+        if hit is not None and hit[0] == mtime:
+            data = hit[1]
+        elif orjson is not None:
+            data = orjson.loads(self.fp.read())
+        else:
+            data = json.loads(self.fp.read())
+        if path is not None:
+            # most recently used at the end
+            _CACHE[path] = (mtime, data)
+            if len(_CACHE) > _CACHE_SIZE:
+                del _CACHE[next(iter(_CACHE))]
+        res = copy.deepcopy(data)
         self.json = res
         return res
 
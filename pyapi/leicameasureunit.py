@@ -70,6 +70,7 @@ class LeicaMeasureUnit(MeasureUnit):
 
     # Constants for EDM programs
     edmProg = {'STOP': 0, 'DEFAULT': 1, 'TRACKING': 2, 'CLEAR': 3}
+    _HAS_EDM_PROG = True
 
     def __init__(self, name='Leica generic', typ='TPS'):
         """ Constructor to leica generic ts
@@ -77,6 +78,20 @@ class LeicaMeasureUnit(MeasureUnit):
         # call super class init
         super().__init__(name, typ)
 
+    def __init_subclass__(cls, **kwargs):
+        """ Set code attributes for subclasses with own codes
+        """
+        super().__init_subclass__(**kwargs)
+        cls.SetCodeAttributes()
+
+    @classmethod
+    def SetCodeAttributes(cls):
+        """ Create an integer class attribute for each message code,
+            e.g. MOVE_CODE for codes['MOVE'], to avoid dict lookups
+        """
+        for key, val in cls.codes.items():
+            setattr(cls, key + '_CODE', val)
+
     @staticmethod
     def GetCapabilities():
         """ Get instrument specialities
@@ -339,7 +354,7 @@ class LeicaMeasureUnit(MeasureUnit):
         # change angles to radian
         hz_rad = hz.GetAngle('RAD')
         v_rad = v.GetAngle('RAD')
-        return f"%R1Q,{self.codes['MOVE']}:{hz_rad},{v_rad},0,{atr},0"
+        return f"%R1Q,{self.MOVE_CODE}:{hz_rad},{v_rad},0,{atr},0"
 
     def MeasureMsg(self, prg=1, incl=0):
         """ Measure distance
@@ -349,7 +364,7 @@ class LeicaMeasureUnit(MeasureUnit):
 
             :returns: measure message
         """
-        return f"%R1Q,{self.codes['MEASURE']}:{prg},{incl}"
+        return f"%R1Q,{self.MEASURE_CODE}:{prg},{incl}"
 
     def GetMeasureMsg(self, wait=15000, incl=0):
         """ Get measured distance
@@ -358,7 +373,7 @@ class LeicaMeasureUnit(MeasureUnit):
             :param incl: inclination calculation - 0/1/2 = measure always (slow)/calculate (fast)/automatic, optional (default 0)
             :returns: get simple measurement message
         """
-        return f"%R1Q,{self.codes['GETMEASURE']}:{wait},{incl}"
+        return f"%R1Q,{self.GETMEASURE_CODE}:{wait},{incl}"
 
     def MeasureDistAngMsg(self, prg):
         """ Measure angles and distance
@@ -367,9 +382,9 @@ class LeicaMeasureUnit(MeasureUnit):
             :returns: measure angle distance message
 
         """
-        if type(prg) is str:
+        if isinstance(prg, str):
             prg = self.edmProg[prg]
-        return f"%R1Q,{self.codes['MEASUREANGDIST']}:{prg}"
+        return f"%R1Q,{self.MEASUREANGDIST_CODE}:{prg}"
 
     def CoordsMsg(self, wait=15000, incl=0):
         """ Get coordinates
@@ -378,14 +393,14 @@ class LeicaMeasureUnit(MeasureUnit):
             :param incl: inclination calculation - 0/1/2 = measure always (slow)/calculate (fast)/automatic, optional (default 0)
             :returns: get coordinates message
         """
-        return f"%R1Q,{self.codes['COORDS']}:{wait},{incl}"
+        return f"%R1Q,{self.COORDS_CODE}:{wait},{incl}"
 
     def GetAnglesMsg(self):
         """ Get angles
 
                 :returns: get angles message
         """
-        return f"%R1Q,{self.codes['GETANGLES']}:0"
+        return f"%R1Q,{self.GETANGLES_CODE}:0"
 
     def ClearDistanceMsg(self):
         """ Clearing distance
@@ -458,3 +473,6 @@ class LeicaMeasureUnit(MeasureUnit):
             :returns: instrument internal temperature
         """
         return f"%R1Q,{self.codes['INTTEMP']}:"
+
+# code attributes of the base class
+LeicaMeasureUnit.SetCodeAttributes()
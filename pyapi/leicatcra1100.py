@@ -68,6 +68,9 @@ class LeicaTCRA1100(LeicaMeasureUnit):
         'SEARCHTARGET': 17020
     }
 
+    # message templates with the codes above
+    _REDLASER_FMT = f"%R1Q,{codes['SETREDLASER']}:" + "{}"
+
     # Constants for EMD modes
     # RT = Reflector Tape, RL = Reflectorless, LR = Long Range
     edmModes = {'RTSTANDARD': 1, 'STANDARD': 2, 'FAST': 3, 'LRSTANDARD': 4, \
@@ -89,4 +92,4 @@ class LeicaTCRA1100(LeicaMeasureUnit):
             :param on: 0/1 turn off/on read laser
             :returns: red laser on/off message
         """
-        return f"%R1Q,{self.codes['SETREDLASER']}:{on}"
+        return self._REDLASER_FMT.format(on)
@@ -68,6 +68,11 @@ class LeicaTPS1200(LeicaMeasureUnit):
         'SEARCHTARGET': 17020
     }
 
+    # message templates with the codes above
+    _SEARCHAREA_FMT = f"%R1Q,{codes['SETSEARCHAREA']}:" + "{},{},{},{},{}"
+    _POWERSEARCH_FMT = f"%R1Q,{codes['POWERSEARCH']}:" + "{},0"
+    _REDLASER_FMT = f"%R1Q,{codes['SETREDLASER']}:" + "{}"
+
     # Constants for EMD modes
     # RT = Reflector Tape, RL = Reflectorless, LR = Long Range
     edmModes = {'RTSTANDARD': 1, 'STANDARD': 2, 'FAST': 3, 'LRSTANDARD': 4, \
@@ -92,7 +97,10 @@ class LeicaTPS1200(LeicaMeasureUnit):
             :param vRange: vertical range to search (Angle)
             :param on: 0/1 off/on
         """
-        return f"%R1Q,{self.codes['SETSEARCHAREA']}:{hzCenter.GetAngle()},{vCenter.GetAngle()},{hzRange.GetAngle()},{vRange.GetAngle()},{on}"
+        return self._SEARCHAREA_FMT.format(hzCenter.GetAngle(),
+                                           vCenter.GetAngle(),
+                                           hzRange.GetAngle(),
+                                           vRange.GetAngle(), on)
 
     def PowerSearchMsg(self, direction):
         """ Power search
@@ -100,7 +108,7 @@ class LeicaTPS1200(LeicaMeasureUnit):
             :param direction: 1/-1 clockwise/counter clockwise
             :returns: Power search message
         """
-        return f"%R1Q,{self.codes['POWERSEARCH']}:{direction},0"
+        return self._POWERSEARCH_FMT.format(direction)
 
     def SetRedLaserMsg(self, on):
         """ Set red laser on/off
@@ -108,4 +116,4 @@ class LeicaTPS1200(LeicaMeasureUnit):
             :param on: 0/1 turn off/on read laser
             :returns: red laser on/off message
         """
-        return f"%R1Q,{self.codes['SETREDLASER']}:{on}"
+        return self._REDLASER_FMT.format(on)
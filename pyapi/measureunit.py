@@ -17,6 +17,15 @@ class MeasureUnit():
             :param name: name of measure unit (str), default None
             :param typ: type of measure unit (str), default None
     """
+    __slots__ = ('name', 'typ')
+
+    # units using EDM program codes set it to True
+    _HAS_EDM_PROG = False
+    # end of message marker of answers, None for interface default
+    _EOM_READ = None
+    # distance is available only after polling (GetMeasure)
+    _POLL_DISTANCE = False
+
     def __init__(self, name=None, typ=None):
         """ constructor for measure unit
         """
@@ -16,6 +16,25 @@ from datetime import datetime
 from angle import Angle
 from measureunit import MeasureUnit
 
+# field separators in NMEA sentences
+FIELD_SEP = re.compile(r'[,\*]')
+
+def xor_bytes(data):
+    """ XOR of all bytes, the bytes are loaded into a single integer and
+        folded in halves, so the number of operations is log2(len(data))
+
+        :param data: bytes to process
+        :returns: XOR of bytes (int)
+    """
+    n = 1
+    while n < len(data):
+        n *= 2
+    w = int.from_bytes(data, 'little')
+    while n > 1:
+        n //= 2
+        w = (w >> (8 * n)) ^ (w & ((1 << (8 * n)) - 1))
+    return w
+
 class NmeaGnssUnit(MeasureUnit):
 
     """ NMEA measure unit
@@ -67,13 +86,12 @@ class NmeaGnssUnit(MeasureUnit):
             :param msg: NMEA message
             :returns: True/False
         """
-        data, cksum = msg.split('*')
-        cksum1 = 0
-        for s in data[1:]:
-            cksum1 ^= ord(s)
-        if cksum.lower() != hex(cksum1).lower()[-2:]:
+        data, _, cksum = msg.partition('*')
+        cksum1 = xor_bytes(data[1:].encode('ascii', 'ignore'))
+        try:
+            return int(cksum, 16) == cksum1
+        except ValueError:
             return False
-        return True
 
     @staticmethod
     def NmeaDateTime(msg):
@@ -83,7 +101,7 @@ class NmeaGnssUnit(MeasureUnit):
             :returns: dete/time or None
         """
         d = None
-        lst = re.split(r'[,\*]', msg)
+        lst = FIELD_SEP.split(msg)
         if len(lst) < 5:
             logging.error("Invalid ZDA message, few fields: %s", msg)
             return None
@@ -110,7 +128,7 @@ class NmeaGnssUnit(MeasureUnit):
         """
         msg_type = msg[3:6]
         msg_keys = self.MSGS_KEYS[msg_type]
-        lst = re.split(r'[,\*]', msg)
+        lst = FIELD_SEP.split(msg)
         if len(lst) < len(msg_keys):
             logging.error("Invalid message, few fields: %s", msg)
             return None
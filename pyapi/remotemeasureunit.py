@@ -77,6 +77,7 @@ class RemoteMeasureUnit(MeasureUnit):
 
 
     edmProg = {'STOP': 0, 'DEFAULT': 1, 'TRACKING': 2, 'CLEAR': 3}
+    _HAS_EDM_PROG = True
 
     def __init__(self, name = 'REMOTE STATION', typ = 'VIRTUAL'):
         """ Constructor to remote total station
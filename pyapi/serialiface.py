@@ -11,6 +11,7 @@
     Daniel Moka <mokadaniel@citromail.hu>
 """
 
+import sys
 import logging
 import serial
 from iface import Iface
@@ -70,6 +71,25 @@ class SerialIface(Iface):
             self.state = self.IF_ERROR
             logging.error(" cannot close serial line")
 
+    def SetLowLatency(self, on=True):
+        """ Set low latency mode of serial driver (Linux only), it reduces
+            the receive latency timer of USB serial adapters (e.g. 16 ms
+            on FTDI) to 1 ms
+
+            :param on: True/False low latency on/off
+            :returns: True on success
+        """
+        if self.ser is None or not sys.platform.startswith('linux') or \
+           not hasattr(self.ser, 'set_low_latency_mode'):
+            return False
+        try:
+            # TIOCSSERIAL ioctl with ASYNC_LOW_LATENCY flag
+            self.ser.set_low_latency_mode(on)
+        except Exception:
+            logging.warning(" cannot set low latency mode on serial line")
+            return False
+        return True
+
     def GetLine(self):
         """ read from serial interface until end of line
 
@@ -79,21 +99,24 @@ class SerialIface(Iface):
             logging.error(" serial line not opened")
             return None
         # read answer till end of message marker
+        eom = self.eomRead.encode('ascii')
         ans = ''
-        w = -1 * len(self.eomRead)
-        while ans[w:] != self.eomRead:
-            ch = ''
-            try:
-                ch = (self.ser.read(1)).decode('ascii')
-            except Exception:
-                self.state = self.IF_READ
-                logging.error(" cannot read serial line")
-            if ch == '':
-                # timeout exit loop
-                self.state = self.IF_TIMEOUT
-                logging.error(" timeout on serial line")
-                break
-            ans += ch
+        buf = b''
+        try:
+            # timeout of read_until is for the whole call, continue while
+            # characters arrive, so timeout is between characters
+            while not buf.endswith(eom):
+                part = self.ser.read_until(eom)
+                if not part:
+                    # nothing got in timeout
+                    self.state = self.IF_TIMEOUT
+                    logging.error(" timeout on serial line")
+                    break
+                buf += part
+            ans = buf.decode('ascii')
+        except Exception:
+            self.state = self.IF_READ
+            logging.error(" cannot read serial line")
         # remove end of line
         logging.debug(" message got: %s", ans)
         ans = ans.strip(self.eomRead)
@@ -102,19 +125,20 @@ class SerialIface(Iface):
     def PutLine(self, msg):
         """ send message through the serial line
 
-            :param msg: message to send (str)
+            :param msg: message to send (str or bytes)
             :returns: 0 - on OK, -1 on error or interface is in error state
         """
         # do nothing if interface is in error state
         if self.ser is None or self.state != self.IF_OK:
             logging.error(" serial line not opened or in error state")
             return -1
+        if not isinstance(msg, bytes):
+            # remove special characters
+            msg = msg.encode('ascii', 'ignore')
         # add CR/LF to message end
-        w = -1 * len(self.eomWrite)
-        if msg[w:] != self.eomWrite:
-            msg += self.eomWrite
-        # remove special characters
-        msg = msg.encode('ascii', 'ignore')
+        eom = self.eomWrite.encode('ascii')
+        if not msg.endswith(eom):
+            msg += eom
         # send message to serial interface
         logging.debug(" message sent: %s", msg)
         try:
@@ -128,10 +152,10 @@ class SerialIface(Iface):
     def Send(self, msg):
         """ send message to serial line and read answer
 
-            :param msg: message to send, it can be multipart message separated by '|' (str)
+            :param msg: message to send, it can be multipart message separated by '|' (str or bytes)
             :returns: answer from instrument (str)
         """
-        msglist = msg.split("|")
+        msglist = msg.split(b'|' if isinstance(msg, bytes) else '|')
         res = ''
         #sending
         for m in msglist:
@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+"""
+.. module:: threadwriter.py
+   :platform: Unix, Windows
+   :synopsis: Ulyxes - an open source project to drive total stations and
+           publish observation results.
+           GPL v2.0 license
+           Copyright (C) 2010- Zoltan Siki <siki.zoltan@epito.bme.hu>
+
+.. moduleauthor:: Zoltan Siki <siki.zoltan@epito.bme.hu>
+"""
+
+import datetime
+import logging
+import queue
+import threading
+from writer import Writer
+
+class ThreadWriter(Writer):
+    """ Class to write observations in a background thread through another
+        writer, WriteData only puts data into a queue so slow output does
+        not delay the observations
+
+            :param wrt: writer to use in the background thread (Writer)
+            :param maxsize: maximal number of records waiting, WriteData
+                blocks if the queue is full, default 1024
+    """
+
+    def __init__(self, wrt, maxsize=1024):
+        """ Constructor
+        """
+        super().__init__(wrt.name, wrt.angleFormat, wrt.distFormat,
+                         wrt.dtFormat, wrt.filt)
+        self.wrt = wrt
+        self.q = queue.Queue(maxsize=maxsize)
+        self.thread = threading.Thread(target=self._write_loop, daemon=True)
+        self.thread.start()
+
+    def _write_loop(self):
+        """ Write queued data until None is got
+        """
+        while True:
+            data = self.q.get()
+            if data is None:
+                break
+            if self.wrt.WriteData(data) == -1:
+                self.state = self.WR_WRITE
+
+    def WriteData(self, data):
+        """ Queue observation data to write
+
+            :param data: dictionary with observation data
+            :returns: 0/-1 OK/writer closed
+        """
+        if data is None:
+            return 0
+        if not self.thread.is_alive():
+            logging.error(" writer thread stopped")
+            return -1
+        # time of observation not time of writing
+        if 'datetime' not in data:
+            data['datetime'] = datetime.datetime.now()
+        self.q.put(data)
+        return 0
+
+    def Close(self):
+        """ Write all queued data and stop the background thread
+        """
+        if self.thread.is_alive():
+            self.q.put(None)
+            self.thread.join()
+
+if __name__ == "__main__":
+    from angle import Angle
+    from echowriter import EchoWriter
+    my = ThreadWriter(EchoWriter())
+    data = {'hz': Angle(0.12345), 'v': Angle(100.2365, 'GON'), 'dist': 123.6581}
+    my.WriteData(data)
+    my.Close()
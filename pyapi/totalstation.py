@@ -13,7 +13,6 @@ import logging
 import time
 from instrument import Instrument
 from angle import Angle
-from trimble5500 import Trimble5500
 #try:
 #    from bluetoothiface import BluetoothIface
 #except:
@@ -26,18 +25,33 @@ class TotalStation(Instrument):
             :param measureIface: interface to physical unit
             :param writerUnit: store data, default None
     """
+    __slots__ = ('_batch', '_cache', '_last_angles', '_has_pending_distance')
+
     FACE_LEFT = 0
     FACE_RIGHT = 1
     FACE_AVG = 2
+    # constant angles, do not change them in place (+=, Positive)
+    _HALF_TURN = Angle(180, 'DEG')
+    _FULL_TURN = Angle(360, 'DEG')
+    _DEFAULT_HZ_RANGE = Angle(399.9999, 'GON')
+    _DEFAULT_V_RANGE = Angle(95, 'DEG')
 
     def __init__(self, name, measureUnit, measureIface, writerUnit=None):
         """ Constructor
         """
         # call super class init
         super().__init__(name, measureUnit, measureIface, writerUnit)
-        if isinstance(measureUnit, Trimble5500):
-            # change default eol marker for read
-            measureIface.eomRead = '>'
+        if measureUnit._EOM_READ is not None:
+            # change default eol marker for read (Trimble 5500)
+            measureIface.eomRead = measureUnit._EOM_READ
+            # short answers, reduce USB serial latency
+            if hasattr(measureIface, 'SetLowLatency'):
+                measureIface.SetLowLatency()
+        self._batch = None  # messages collected in batch mode
+        self._cache = {}    # answers of getters for settings
+        self._last_angles = None    # last known direction of telescope
+        # distance may be buffered in instrument, unknown at start
+        self._has_pending_distance = True
 
 #        self.__class__.add_totalStation(self)
 
@@ -52,12 +66,94 @@ class TotalStation(Instrument):
         return "{}('{}',{},'{}')".format(type(self).__name__, self.name,
                                          muString, self.measureIface.GetName())
 
+    def _process(self, msg, pic=None):
+        """ Send message to measure unit and process answer, in batch mode
+            the message is only stored
+
+            :param msg: message to send
+            :param pic: when using a camera you have tive give writable binary file
+            :returns: parsed answer (dictionary), empty dictionary in batch mode
+        """
+        if self._batch is not None:
+            self._last_angles = None    # answers are processed later
+            self._batch.append(msg)
+            return {}
+        res = super()._process(msg, pic)
+        if self.measureIface.state != self.measureIface.IF_OK or \
+                'errorCode' in res:
+            # instrument may be in unknown state
+            self._last_angles = None
+        return res
+
+    def _cached(self, key, msg):
+        """ Process message of a getter for a setting, the answer is
+            stored and reused until the setting is changed by a setter
+
+            :param key: cache key
+            :param msg: message to send
+            :returns: processed answer from instrument (dictionary)
+        """
+        if key in self._cache:
+            return dict(self._cache[key])
+        res = self._process(msg)
+        if res and 'errorCode' not in res:
+            self._cache[key] = dict(res)
+        return res
+
+    def _keep_angles(self, res):
+        """ Store actual direction of telescope after a Move, it is
+            used by the next MoveRel until the telescope is moved by
+            an other command or an error occurs
+
+            :param res: processed answer with hz and v angles
+        """
+        if self._batch is None and 'hz' in res and 'v' in res and \
+                self.measureIface.state == self.measureIface.IF_OK:
+            self._last_angles = {'hz': Angle(res['hz'].GetAngle()),
+                                 'v': Angle(res['v'].GetAngle())}
+
+    def InvalidateCache(self, key=None):
+        """ Drop stored answers of getters, e.g. after the settings were
+            changed on the instrument manually
+
+            :param key: cache key to drop, default all (also the last
+                direction)
+        """
+        if key is None:
+            self._cache.clear()
+            self._last_angles = None
+        else:
+            self._cache.pop(key, None)
+
+    def BeginBatch(self):
+        """ Start collecting messages, the messages are sent together by
+            EndBatch. Only independent commands can be batched, methods
+            using the answer of an other command (e.g. MoveRel, ChangeFace,
+            GetFace, SetSearchArea without center) do not work in batch mode
+        """
+        self._batch = []
+
+    def EndBatch(self):
+        """ Send collected messages as one multipart message and
+            stop batch mode
+
+            :returns: processed answers from instrument (dictionary)
+        """
+        msgs = self._batch
+        self._batch = None
+        if not msgs:
+            return {}
+        return self._process('|'.join(msgs))
+
     def SetPc(self, pc):
         """ Set prism constant
 
             :param pc: prism constant [m]
             :returns: processed answer from instrument
         """
+        # prism type may change to user defined on instrument
+        self.InvalidateCache('pc')
+        self.InvalidateCache('pt')
         msg = self.measureUnit.SetPcMsg(pc)
         return self._process(msg)
 
@@ -67,7 +163,7 @@ class TotalStation(Instrument):
             :returns: processed answer from instrument
         """
         msg = self.measureUnit.GetPcMsg()
-        return self._process(msg)
+        return self._cached('pc', msg)
 
     def SetATR(self, atr):
         """ Set ATR on
@@ -90,6 +186,9 @@ class TotalStation(Instrument):
         """ Set prism type
             :param typ: prizm type
         """
+        # prism constant changes with prism type
+        self.InvalidateCache('pt')
+        self.InvalidateCache('pc')
         msg = self.measureUnit.SetPrismTypeMsg(typ)
         return self._process(msg)
 
@@ -97,7 +196,7 @@ class TotalStation(Instrument):
         """ Get prism type
         """
         msg = self.measureUnit.GetPrismTypeMsg()
-        return self._process(msg)
+        return self._cached('pt', msg)
 
     def SetLock(self, lock):
         """ Set lock on prism
@@ -105,6 +204,8 @@ class TotalStation(Instrument):
             :param lock: 0/1 lock off/on
             :returns: processed answer from instrument
         """
+        if lock:
+            self._last_angles = None    # instrument follows the prism
         msg = self.measureUnit.SetLockMsg(lock)
         return self._process(msg)
 
@@ -121,6 +222,7 @@ class TotalStation(Instrument):
 
             :returns: empty
         """
+        self._last_angles = None    # instrument follows the prism
         msg = self.measureUnit.LockInMsg()
         return self._process(msg)
 
@@ -134,6 +236,7 @@ class TotalStation(Instrument):
         """
         if wetTemp is None:
             wetTemp = dryTemp - 5.0
+        self.InvalidateCache('atm')
         msg = self.measureUnit.SetAtmCorrMsg(valueOfLambda, pres, dryTemp,
                                              wetTemp)
         return self._process(msg)
@@ -144,7 +247,7 @@ class TotalStation(Instrument):
             :returns: atmospheric corrections (dictionary)
         """
         msg = self.measureUnit.GetAtmCorrMsg()
-        return self._process(msg)
+        return self._cached('atm', msg)
 
     def SetRefCorr(self, status, earthRadius, refracticeScale):
         """ Set refraction correction
@@ -153,6 +256,7 @@ class TotalStation(Instrument):
             :param earthRadius: radius of earth
             :param refracticeScale: ???
         """
+        self.InvalidateCache('ref')
         msg = self.measureUnit.SetRefCorrMsg(status, earthRadius,
                                              refracticeScale)
         return self._process(msg)
@@ -163,7 +267,7 @@ class TotalStation(Instrument):
             :returns: refraction correction (dictionary)
         """
         msg = self.measureUnit.GetRefCorrMsg()
-        return self._process(msg)
+        return self._cached('ref', msg)
 
     def SetStation(self, easting, northing, elevation, ih=0.0):
         """ Set station coordinates
@@ -174,6 +278,7 @@ class TotalStation(Instrument):
             :param ih: instrument height
             :returns: ???
         """
+        self.InvalidateCache('stn')
         msg = self.measureUnit.SetStationMsg(easting, northing, elevation, ih)
         return self._process(msg)
 
@@ -183,7 +288,7 @@ class TotalStation(Instrument):
             :returns: station coordinates and instrument height (dictionary)
         """
         msg = self.measureUnit.GetStationMsg()
-        return self._process(msg)
+        return self._cached('stn', msg)
 
     def SetEDMMode(self, mode):
         """ Set EDM mode
@@ -191,6 +296,7 @@ class TotalStation(Instrument):
             :param mode: mode name/id as listed in measure unit
             :returns: empty dictionary
         """
+        self.InvalidateCache('edm')
         msg = self.measureUnit.SetEDMModeMsg(mode)
         return self._process(msg)
 
@@ -200,7 +306,7 @@ class TotalStation(Instrument):
             :returns: actual EDM mode
         """
         msg = self.measureUnit.GetEDMModeMsg()
-        return self._process(msg)
+        return self._cached('edm', msg)
 
     def SetOri(self, ori):
         """ Set orientation
@@ -208,10 +314,13 @@ class TotalStation(Instrument):
             :param ori: bearing to direction (Angle)
             :returns: empty dictionary
         """
-        # clear previous distance measured
-        ans = self.Measure('CLEAR')
-        if 'errCode' in ans:
-            return ans
+        # clear previous distance measured, if any
+        if self._has_pending_distance and 'CLEAR' in self.measureUnit.edmProg:
+            ans = self.Measure('CLEAR')
+            if 'errorCode' in ans:
+                return ans
+        self._has_pending_distance = False
+        self._last_angles = None    # horizontal directions change
         msg = self.measureUnit.SetOriMsg(ori)
         return self._process(msg)
 
@@ -231,7 +340,12 @@ class TotalStation(Instrument):
         hz.Positive()    # negative angles are not accepted by totalstations
         v.Positive()
         msg = self.measureUnit.MoveMsg(hz, v, atr)
-        return self._process(msg)
+        res = self._process(msg)
+        self._last_angles = None
+        if not atr and 'errorCode' not in res:
+            # ATR changes the direction to the center of prism
+            self._keep_angles({'hz': hz, 'v': v})
+        return res
 
     def Measure(self, prg='DEFAULT', incl=0):
         """ Measure distance
@@ -240,10 +354,14 @@ class TotalStation(Instrument):
             :param incl: not used, only for compability
             :returns: empty dictionary
         """
-        if type(prg) is str:
+        clear = prg == 'CLEAR'
+        if self.measureUnit._HAS_EDM_PROG and isinstance(prg, str):
             prg = self.measureUnit.edmProg[prg]
         msg = self.measureUnit.MeasureMsg(prg, incl)
-        return self._process(msg)
+        res = self._process(msg)
+        if 'errorCode' not in res:
+            self._has_pending_distance = not clear
+        return res
 
     def GetMeasure(self, wait=15000, incl=0):
         """ Get measured values
@@ -253,13 +371,20 @@ class TotalStation(Instrument):
             :returns: observations in a dictionary
         """
         msg = self.measureUnit.GetMeasureMsg(wait, incl)
-        i = 0
         meas = self._process(msg)
-        if isinstance(self.measureUnit, Trimble5500):
-            while 'distance' not in meas and i < 20:   # wait for trimble 5500
-                i += 1
-                time.sleep(2)
+        if self.measureUnit._POLL_DISTANCE:
+            # wait for trimble 5500, poll often first then slow down
+            deadline = time.monotonic() + wait / 1000.0
+            delay = 0.05
+            while 'distance' not in meas and self._batch is None:
+                left = deadline - time.monotonic()
+                if left <= 0:
+                    break
+                time.sleep(min(delay, left))
+                delay = min(delay * 1.5, 2.0)
                 meas = self._process(msg)
+        if 'distance' in meas:
+            self._has_pending_distance = True
         return meas
 
     def MeasureDistAng(self, prg='DEFAULT'):
@@ -267,10 +392,13 @@ class TotalStation(Instrument):
 
             :returns: observations in a dictionary
         """
-        if type(prg) is str:
+        if self.measureUnit._HAS_EDM_PROG and isinstance(prg, str):
             prg = self.measureUnit.edmProg[prg]
         msg = self.measureUnit.MeasureDistAngMsg(prg)
-        return self._process(msg)
+        res = self._process(msg)
+        if 'errorCode' not in res:
+            self._has_pending_distance = True
+        return res
 
     def Coords(self, wait=15000, incl=0):
         """ Read coordinates from instrument
@@ -294,7 +422,10 @@ class TotalStation(Instrument):
         """ Clear measured distance on instrument
         """
         msg = self.measureUnit.ClearDistanceMsg()
-        return self._process(msg)
+        res = self._process(msg)
+        if 'errorCode' not in res:
+            self._has_pending_distance = False
+        return res
 
     def ChangeFace(self):
         """ Change face
@@ -304,9 +435,10 @@ class TotalStation(Instrument):
         msg = self.measureUnit.ChangeFaceMsg()
         if msg is None:
             angles = self.GetAngles()
-            angles['hz'] += Angle(180, 'DEG')
-            angles['v'] = Angle(360, 'DEG') - angles['v']
+            angles['hz'] += self._HALF_TURN
+            angles['v'] = self._FULL_TURN - angles['v']
             return self.Move(angles['hz'], angles['v'])
+        self._last_angles = None
         return self._process(msg)
 
     def SetRedLaser(self, on):
@@ -335,9 +467,9 @@ class TotalStation(Instrument):
             if vCenter is None:
                 vCenter = angles['v']
             if hzRange is None:
-                hzRange = Angle(399.9999, 'GON')
+                hzRange = self._DEFAULT_HZ_RANGE
             if vRange is None:
-                vRange = Angle(95, 'DEG')
+                vRange = self._DEFAULT_V_RANGE
         msg = self.measureUnit.SetSearchAreaMsg(hzCenter, vCenter, hzRange,
                                                 vRange, on)
         return self._process(msg)
@@ -348,6 +480,7 @@ class TotalStation(Instrument):
             :param direction: 1/-1 clockwise/counter clockwise
             :returns: empty list if succesfull
         """
+        self._last_angles = None
         msg = self.measureUnit.PowerSearchMsg(direction)
         return self._process(msg)
 
@@ -373,6 +506,7 @@ class TotalStation(Instrument):
 
             :returns: TODO
         """
+        self._last_angles = None
         msg = self.measureUnit.SearchTargetMsg()
         return self._process(msg)
 
@@ -382,6 +516,7 @@ class TotalStation(Instrument):
             :param mode: 0/1 local/remote mode
             :returns: empty list if successful, timeout may occure
         """
+        self.InvalidateCache()  # settings may change on power cycle
         msg = self.measureUnit.SwitchOnMsg(mode)
         return self._process(msg)
 
@@ -391,6 +526,7 @@ class TotalStation(Instrument):
             :param mode: 0/1 power down/sleep state
             :returns: processed answer from instrument
         """
+        self.InvalidateCache()  # settings may change on power cycle
         msg = self.measureUnit.SwitchOffMsg()
         return self._process(msg)
 
@@ -400,7 +536,7 @@ class TotalStation(Instrument):
             :returns: processed answer from instrument
         """
         msg = self.measureUnit.GetInstrumentNoMsg()
-        return self._process(msg)
+        return self._cached('instrNo', msg)
 
     def GetInstrumentName(self):
         """ Get instrument name
@@ -408,7 +544,7 @@ class TotalStation(Instrument):
             :returns: processed answer from instrument
         """
         msg = self.measureUnit.GetInstrumentNameMsg()
-        return self._process(msg)
+        return self._cached('instrName', msg)
 
     def GetInternalTemperature(self):
         """ Get instrument internal temperature
@@ -439,14 +575,32 @@ class TotalStation(Instrument):
             :param hz_rel: relative horizontal rotation (Angle)
             :param v_rel: relative zenith rotation (Angle)
             :param atr: 0/1 atr on/off
-        """
-        #get the actual direction
-        msg = self.measureUnit.GetAnglesMsg()
-        res = self._process(msg)
+
+            The target direction of the previous Move without ATR is used
+            as base if the telescope was not moved by an other command
+            (e.g. SetOri, ChangeFace, PowerSearch, SearchTarget, LockIn)
+            and no error occured since it, else the instrument is queried.
+            The instrument is queried for ATR and zero rotations too, these
+            follow manual aiming usually
+        """
+        #get the actual direction, use the last move if not changed since
+        res = self._last_angles
+        if res is None or atr or \
+                (hz_rel.GetAngle() == 0 and v_rel.GetAngle() == 0):
+            msg = self.measureUnit.GetAnglesMsg()
+            res = self._process(msg)
         if 'hz' in res and 'v' in res:
             return self.Move(res['hz'] + hz_rel, res['v'] + v_rel, atr)
         return None
 
+def __getattr__(name):
+    """ Import measure units on demand, e.g. totalstation.Trimble5500
+    """
+    if name == 'Trimble5500':
+        from trimble5500 import Trimble5500
+        return Trimble5500
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 if __name__ == "__main__":
     from echowriter import EchoWriter
     from serialiface import SerialIface
@@ -454,6 +608,7 @@ if __name__ == "__main__":
     #from leicatps1200 import LeicaTPS1200
     #from leicatcra1100 import LeicaTCRA1100
     #from leicatca1800 import LeicaTCA1800
+    #from trimble5500 import Trimble5500
 
     logging.getLogger().setLevel(logging.DEBUG)
     mu = Axis10()
@@ -12,6 +12,11 @@
 
 from measureunit import MeasureUnit
 from angle import Angle
+try:
+    # compiled parser, see trimble5500_parse.pyx
+    from trimble5500_parse import parse
+except ImportError:
+    parse = None
 
 class Trimble5500(MeasureUnit):
     """ This class contains the Trimble 5500 robotic total station specific
@@ -20,6 +25,8 @@ class Trimble5500(MeasureUnit):
             :param name: name of ts (str), default 'Trimble 5500'
             :param type: type of ts (str), default 'TPS'
     """
+    __slots__ = ('edmMode',)
+
     # Constants for message codes
     codes = {
         'STN': 2,
@@ -46,10 +53,41 @@ class Trimble5500(MeasureUnit):
         'PRESS': 74
     }
 
+    # answer codes to result key and value converter
+    _HANDLERS = {
+        codes['HA']: ('hz', lambda val: Angle(float(val), 'PDEG')),
+        codes['VA']: ('v', lambda val: Angle(float(val), 'PDEG')),
+        codes['SD']: ('distance', float),
+        codes['EASTING']: ('east', float),
+        codes['NORTHING']: ('north', float),
+        codes['ELE']: ('elev', float)
+        # TODO add all codes!
+    }
+
+    # message templates with the codes above
+    _SETPC_FMT = f"WG,{codes['PC']}={{:.3f}}"
+    _GETPC = f"RG,{codes['PC']}"
+    _SETPPM_FMT = f"WG,{codes['PPM']}={{}}"
+    _SETATM_FMT = f"WG,{codes['PRESS']}={{}}|WG,{codes['TEMP']}={{}}|WG,{codes['WETTEMP']}={{}}"
+    _GETATM = f"RG,{codes['PPM']}"
+    _SETREF_FMT = f"WG,{codes['EARAD']}={{}}|WG,{codes['REFRAC']}={{:.2f}}"
+    _GETREF = f"RG,{codes['EARAD']}|RG,{codes['REFRAC']}"
+    _SETSTN_FMT = f"WG,{codes['EASTING']}={{:.3f}}|WG,{codes['NORTHING']}={{:.3f}}"
+    _SETELE_FMT = f"|WG,{codes['ELE']}={{:.3f}}"
+    _SETIH_FMT = f"|WG,{codes['IH']}={{:.3f}}"
+    _GETSTN = f"RG,{codes['EASTING']}|RG,{codes['NORTHING']}|RG,{codes['ELE']}|RG,{codes['IH']}"
+    _SETORI_FMT = f"WG,{codes['HAREF']}={{:.4f}}"
+    # WS=PH02V02 starts the rotation, it must be sent with each move
+    _MOVE_FMT = f"WG,{codes['SVA']}={{:.4f}}|WG,{codes['SHA']}={{:.4f}}|WS=PH02V02"
+    _COORDS = f"RG,{codes['NORTHING']}|RG,{codes['EASTING']}|RG,{codes['ELE']}"
+    _GETANGLES = f"RG,{codes['HA']}|RG,{codes['VA']}"
+
     # Constants for EMD modes
     edmModes = {'STANDARD': 0, 'TRACKING': 1, 'D-BAR': 2, 'FAST': 3,
                 'HRD_BAR': 4}
     edmProg = {'DEFAULT': None}
+    _EOM_READ = '>'
+    _POLL_DISTANCE = True
 
     def __init__(self, name='Trimble 5500', typ='TPS'):
         """ Constructor to leica generic ts
@@ -73,6 +111,9 @@ class Trimble5500(MeasureUnit):
             :param anss: answers got from instrument
             :returns: dictionary
         """
+        if parse is not None:
+            return parse(msgs.encode('ascii', 'ignore'),
+                         anss.encode('ascii', 'ignore'), self._HANDLERS, {})
         msgList = msgs.split('|')
         ansList = anss.split('|')
         res = {}
@@ -80,24 +121,12 @@ class Trimble5500(MeasureUnit):
             if len(msg.strip()) == 0:
                 continue
             # get command id form message
-            ansBufflist = ans.split('\n')
-            for ans1 in ansBufflist:
-                if '=' in ans1:
-                    buf = ans1.strip('\r|').split('=')
-                    commandID = int(buf[0])
-                    if commandID == self.codes['HA']:
-                        res['hz'] = Angle(float(buf[1]), 'PDEG')
-                    elif commandID == self.codes['VA']:
-                        res['v'] = Angle(float(buf[1]), 'PDEG')
-                    elif commandID == self.codes['SD']:
-                        res['distance'] = float(buf[1])
-                    elif commandID == self.codes['EASTING']:
-                        res['east'] = float(buf[1])
-                    elif commandID == self.codes['NORTHING']:
-                        res['north'] = float(buf[1])
-                    elif commandID == self.codes['ELE']:
-                        res['elev'] = float(buf[1])
-                    # TODO add all codes!
+            for ans1 in ans.split('\n'):
+                code, sep, val = ans1.strip('\r|').partition('=')
+                if sep:
+                    handler = self._HANDLERS.get(int(code))
+                    if handler is not None:
+                        res[handler[0]] = handler[1](val)
         return res
 
     def SetPcMsg(self, pc):
@@ -106,14 +135,14 @@ class Trimble5500(MeasureUnit):
             :param pc: prism constant [mm]
             :returns: set prism constant message
         """
-        return 'WG,{0:d}={1:.3f}'.format(self.codes['PC'], pc / 1000.0)
+        return self._SETPC_FMT.format(pc / 1000.0)
 
     def GetPcMsg(self):
         """ Get prism constant
 
             :returns: get prism constant message
         """
-        return f"RG,{self.codes['PC']}"
+        return self._GETPC
 
     def SetAtmCorrMsg(self, ppm, pres=None, dry=None, wet=None):
         """ Set atmospheric correction settings using ppm or
@@ -126,15 +155,15 @@ class Trimble5500(MeasureUnit):
             :returns: set atmospheric correction message
         """
         if ppm is not None:
-            return f"WG,{self.codes['PPM']}={ppm}"
-        return f"WG,{self.codes['PRESS']}={pres}|WG,{self.codes['TEMP']}={dry}|WG,{self.codes['WETTEMP']}={wet}"
+            return self._SETPPM_FMT.format(ppm)
+        return self._SETATM_FMT.format(pres, dry, wet)
 
     def GetAtmCorrMsg(self):
         """ Get atmospheric correction settings
 
             :returns: atmospheric correction message
         """
-        return f"RG,{self.codes['PPM']}"
+        return self._GETATM
 
     def SetRefCorrMsg(self, status, earthRadius, refrac):
         """ Set refraction correction settings
@@ -145,7 +174,7 @@ class Trimble5500(MeasureUnit):
         :returns: set refraction correction message
 
         """
-        return f"WG,{self.codes['EARAD']}={earthRadius}|WG,{self.codes['REFRAC']}={refrac:.2f}"
+        return self._SETREF_FMT.format(earthRadius, refrac)
 
     def GetRefCorrMsg(self):
         """ Get refraction correction setting
@@ -153,7 +182,7 @@ class Trimble5500(MeasureUnit):
             :return: refraction correction message
 
         """
-        return f"RG,{self.codes['EARAD']}|RG,{self.codes['REFRAC']}"
+        return self._GETREF
 
     def SetStationMsg(self, e, n, z=None, ih=0):
         """ Set station coordinates
@@ -165,11 +194,11 @@ class Trimble5500(MeasureUnit):
             :returns: set station coordinates message
 
         """
-        msg = f"WG,{self.codes['EASTING']}={e:.3f}|WG,{self.codes['NORTHING']}={n:.3f}"
+        msg = self._SETSTN_FMT.format(e, n)
         if z is not None:
-            msg += f"|WG,{self.codes['ELE']}={z:.3f}"
+            msg += self._SETELE_FMT.format(z)
         # TODO instrumenrt height
-        msg += f"|WG,{self.codes['IH']}={ih:.3f}"
+        msg += self._SETIH_FMT.format(ih)
         return msg
 
     def GetStationMsg(self):
@@ -178,7 +207,7 @@ class Trimble5500(MeasureUnit):
             :returns: get station coordinates message
 
         """
-        return f"RG,{self.codes['EASTING']}|RG,{self.codes['NORTHING']}|RG,{self.codes['ELE']}|RG,{self.codes['IH']}"
+        return self._GETSTN
 
     def SetEDMModeMsg(self, mode):
         """ Set EDM mode
@@ -186,7 +215,7 @@ class Trimble5500(MeasureUnit):
             :param mode: mode name (str) or code (int)
             :returns: set edm mode message
         """
-        if type(mode) is str:
+        if isinstance(mode, str):
             self.edmMode = self.edmModes[mode]
         else:
             self.edmMode = mode
@@ -206,7 +235,7 @@ class Trimble5500(MeasureUnit):
             :returns: set orientation angle message
 
         """
-        return f"WG,{self.codes['HAREF']}={ori.GetAngle('PDEG'):.4f}"
+        return self._SETORI_FMT.format(ori.GetAngle('PDEG'))
 
     def MoveMsg(self, hz, v, dummy=None):
         """ Rotate instrument to direction
@@ -219,7 +248,7 @@ class Trimble5500(MeasureUnit):
         # change angles to pseudo DMS
         hz_pdms = hz.GetAngle('PDEG')
         v_pdms = v.GetAngle('PDEG')
-        return f"WG,26={v_pdms:.4f}|WG,27={hz_pdms:.4f}|WS=PH02V02"
+        return self._MOVE_FMT.format(v_pdms, hz_pdms)
 
     def MeasureMsg(self, dummy1=None, dummy2=None):
         """ Measure distance
@@ -255,14 +284,14 @@ class Trimble5500(MeasureUnit):
             :param incl: inclination calculation - 0/1/2 = measure always (slow)/calculate (fast)/automatic, optional (default 0)
             :returns: get coordinates message
         """
-        return f"RG,{self.codes['NORTHING']}|RG,{self.codes['EASTING']}|RG,{self.codes['ELE']}"
+        return self._COORDS
 
     def GetAnglesMsg(self):
         """ Get angles
 
                 :returns: get angles message
         """
-        return f"RG,{self.codes['HA']}|RG,{self.codes['VA']}"
+        return self._GETANGLES
 
     def ChangeFaceMsg(self):
         """ Change face
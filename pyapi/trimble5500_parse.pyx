@@ -0,0 +1,76 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""
+.. module:: trimble5500_parse.pyx
+   :platform: Unix, Windows
+   :synopsis: Ulyxes - an open source project to drive total stations and
+       publish observation results.  GPL v2.0 license Copyright (C)
+       2010- Zoltan Siki <siki.zoltan@epito.bme.hu>
+
+.. moduleauthor:: Zoltan Siki <siki.zoltan@epito.bme.hu>
+
+Optional compiled parser for Trimble 5500 answers, build it in place by
+python setup.py build_ext --inplace, Trimble5500.Result falls back to
+the pure Python parser if it is not available.
+"""
+from libc.string cimport memchr
+from libc.stdlib cimport strtol, strtod
+
+def parse(bytes msgs, bytes anss, dict handlers, dict out):
+    """ Parse answer from message, same as Trimble5500.Result
+
+        :param msgs: messages sent to instrument (bytes)
+        :param anss: answers got from instrument (bytes)
+        :param handlers: code to (key, conversion) table
+        :param out: dictionary to fill
+        :returns: out
+    """
+    cdef list msgList = msgs.split(b'|')
+    cdef Py_ssize_t nmsg = len(msgList)
+    cdef Py_ssize_t i = 0
+    cdef const char *buf = anss
+    cdef const char *end = buf + len(anss)
+    cdef const char *p = buf
+    cdef const char *segEnd
+    cdef const char *line
+    cdef const char *lineEnd
+    cdef const char *a
+    cdef const char *b
+    cdef const char *eq
+    cdef char *endp
+    cdef long code
+    cdef double d
+    while i < nmsg and p <= end:
+        segEnd = <const char *>memchr(p, b'|', end - p)
+        if segEnd == NULL:
+            segEnd = end
+        if msgList[i].strip():
+            line = p
+            while line < segEnd:
+                lineEnd = <const char *>memchr(line, b'\n', segEnd - line)
+                if lineEnd == NULL:
+                    lineEnd = segEnd
+                a = line
+                b = lineEnd
+                while a < b and a[0] == b'\r':
+                    a += 1
+                while b > a and b[-1] == b'\r':
+                    b -= 1
+                eq = <const char *>memchr(a, b'=', b - a)
+                if eq != NULL:
+                    code = strtol(a, &endp, 10)
+                    if endp != eq:
+                        code = int(a[:eq - a])  # raises like int()
+                    h = handlers.get(code)
+                    if h is not None:
+                        key, conv = h
+                        if conv is float:
+                            d = strtod(eq + 1, &endp)
+                            if endp == b and b > eq + 1:
+                                out[key] = d
+                                line = lineEnd + 1
+                                continue
+                        out[key] = conv(eq[1:b - eq].decode('ascii'))
+                line = lineEnd + 1
+        p = segEnd + 1
+        i += 1
+    return out
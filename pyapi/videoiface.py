@@ -10,6 +10,7 @@
 
 """
 
+import sys
 import logging
 import os.path
 import cv2
@@ -20,28 +21,46 @@ class VideoIface(Iface):
 
             :param name: name of interface (str), default 'webcam'
             :param source: id of device or file name (int/str), default = 0
+            :param pixel_format: format of images 'bgr'/'gray'/'yuyv', gray
+                and yuyv get raw YUYV frames from the camera if possible,
+                default 'bgr'
     """
-    def __init__(self, name='webcam', source=0):
+    __slots__ = ('source', 'video', 'pixel_format', 'raw', 'height')
+
+    _YUYV = cv2.VideoWriter_fourcc(*'YUYV')
+
+    def __init__(self, name='webcam', source=0, pixel_format='bgr'):
         """ Constructor
         """
         super(VideoIface, self).__init__(name)
         self.source = source
         self.video = None
-        if type(source) is int:
-            # video device source
-            self.video = cv2.VideoCapture(source)
-            # try to read stream
-            ret, _ = self.video.read()
-            if ret is None:
-                self.state = self.IF_SOURCE
-                logging.error(" error opening video camera")
+        self.pixel_format = pixel_format
+        self.raw = False    # frames are packed YUYV
+        if isinstance(source, int):
+            # video device source, V4L2 backend on Linux
+            if sys.platform.startswith('linux'):
+                self.video = cv2.VideoCapture(source, cv2.CAP_V4L2)
             else:
+                self.video = cv2.VideoCapture(source)
+            if self.video.isOpened():
+                # keep only the latest frame in the driver buffer
+                self.video.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+                if pixel_format in ('gray', 'yuyv'):
+                    self._set_raw()
                 self.opened = True
-        elif type(source) is str:
+            else:
+                self.state = self.IF_SOURCE
+                logging.error(" error opening video camera")
+        elif isinstance(source, str):
             # video file source
             if os.path.exists(source) and os.path.isfile(source):
-                self.video = cv2.videoCapture(source)
-                self.opened = True
+                self.video = cv2.VideoCapture(source, cv2.CAP_FFMPEG)
+                if self.video.isOpened():
+                    self.opened = True
+                else:
+                    self.state = self.IF_FILE
+                    logging.error(" error opening video file")
             else:
                 self.state = self.IF_FILE
                 logging.error(" error opening video file")
@@ -58,16 +77,37 @@ class VideoIface(Iface):
             except Exception:
                 pass
 
+    def _set_raw(self):
+        """ Ask for YUYV frames without conversion to BGR, the
+            conversion is left on if the camera uses an other format
+        """
+        self.video.set(cv2.CAP_PROP_FOURCC, self._YUYV)
+        if int(self.video.get(cv2.CAP_PROP_FOURCC)) == self._YUYV:
+            self.video.set(cv2.CAP_PROP_CONVERT_RGB, 0)
+            self.height = int(self.video.get(cv2.CAP_PROP_FRAME_HEIGHT))
+            self.raw = True
+        else:
+            logging.warning(" YUYV format not supported by camera")
+
     def GetImage(self):
         """ Get image from stream
 
-            :returns: an image or None
+            :returns: an image or None, gray images are views of the
+                luminance bytes of YUYV frames if possible
         """
         if self.state == self.IF_OK:
             ret, img = self.video.read()
-            if ret is None:
+            if not ret:
                 self.state = self.IF_EOF
                 logging.warning(" eof on video source")
+                return None
+            if self.pixel_format == 'gray':
+                if not self.raw:
+                    return cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+                if img.ndim == 3:
+                    return img[..., 0]  # Y bytes of (h, w, 2) frame
+                # Y bytes of packed YUYV rows, single row buffer reshaped
+                return img.reshape(self.height, -1)[:, ::2]
             return img
         return None
 
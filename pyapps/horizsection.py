@@ -55,6 +55,7 @@ import re
 import math
 import logging
 import argparse
+import atexit
 
 # check PYTHONPATH
 if len([p for p in sys.path if 'pyapi' in p]) == 0:
@@ -70,6 +71,7 @@ from serialiface import SerialIface
 from georeader import GeoReader
 from csvreader import CsvReader
 from csvwriter import CsvWriter
+from threadwriter import ThreadWriter
 from confreader import ConfReader
 from leicatps1200 import LeicaTPS1200
 from leicatcra1100 import LeicaTCRA1100
@@ -82,6 +84,12 @@ from robot import Robot
 from freestation import Freestation
 from anystation import AnyStation
 
+# patterns for parameters
+RE_1100 = re.compile('110[0-9]$')
+RE_1200 = re.compile('120[0-9]$')
+RE_5500 = re.compile('550[0-9]$')
+RE_CSV = re.compile(r'\.(txt|csv)$')
+
 class HorizontalSection():
     """ Measure a horizontal section at a given elevation
 
@@ -131,11 +139,13 @@ class HorizontalSection():
             :param measure: disctionary of observations
             :returns: dictionary of coords
         """
-        hd = measure['distance'] * math.sin(measure['v'].GetAngle())
-        east = self.st_east + hd * math.sin(measure['hz'].GetAngle())
-        north = self.st_north + hd * math.cos(measure['hz'].GetAngle())
-        elev = self.hoc +  measure['distance'] * math.cos(measure['v'].GetAngle())
-        return {'east': east, 'north': north, 'elev': elev}
+        dist = measure['distance']
+        v = measure['v'].GetAngle()
+        hz = measure['hz'].GetAngle()
+        hd = dist * math.sin(v)
+        return {'east': self.st_east + hd * math.sin(hz),
+                'north': self.st_north + hd * math.cos(hz),
+                'elev': self.hoc + dist * math.cos(v)}
 
     def run(self):
         """ do the observations in horizontal section """
@@ -147,7 +157,7 @@ class HorizontalSection():
 
         if self.elev is None:
             ans = self.ts.Measure()    # initial measurement for startpoint
-            if 'errCode' in ans:
+            if 'errorCode' in ans:
                 print('FATAL Cannot measure startpoint')
                 return 1
             startp = self.ts.GetMeasure()
@@ -164,49 +174,60 @@ class HorizontalSection():
             self.ts.SetRedLaser(1)       # turn on red laser if possible
         except Exception:
             pass
-        act = Angle(0)  # actual angle from startpoint
-        while act.GetAngle() < self.maxa.GetAngle(): # go around the whole section
-            ans = self.ts.Measure() # measure distance
-            if self.ts.measureIface.state != self.ts.measureIface.IF_OK or \
-                    'errCode' in ans:
+        # local names for the loop
+        ts = self.ts
+        iface = ts.measureIface
+        ok = iface.IF_OK
+        step = self.stepinterval
+        step_rad = step.GetAngle()
+        max_rad = self.maxa.GetAngle()
+        zero = Angle(0)
+        dz = height0 - self.hoc # height difference from the height of collimation
+        act = 0.0  # actual angle from startpoint [rad]
+        while act < max_rad: # go around the whole section
+            ans = ts.Measure() # measure distance
+            if iface.state != ok or 'errorCode' in ans:
                 # skip this and move to next point
                 logging.warning('Cannot measure point, skip')
-                self.ts.measureIface.state = self.ts.measureIface.IF_OK
-                self.ts.MoveRel(self.stepinterval, Angle(0))
-                act += self.stepinterval
+                iface.state = ok
+                ts.MoveRel(step, zero)
+                act += step_rad
                 continue
-            nextp = self.ts.GetMeasure()  # get observation data
+            nextp = ts.GetMeasure()  # get observation data
             if self.invalid(nextp):
                 # cannot measure, skip
                 logging.warning('Cannot measure point, skip')
-                self.ts.measureIface.state = self.ts.measureIface.IF_OK
-                self.ts.MoveRel(self.stepinterval, Angle(0))
-                act += self.stepinterval
+                iface.state = ok
+                ts.MoveRel(step, zero)
+                act += step_rad
                 continue
             coords = self.Coords(nextp)
             height = coords['elev']
             index = 0
             while abs(height-height0) > self.tol:  # looking for right elevation
                 w = True
+                if index >= self.maxiter:
+                    # give up before another roundtrip to the instrument
+                    w = False
+                    logging.warning('Missing measurement')
+                    break
+                # zenith angle to the section elevation in one step,
+                # exact if the horizontal distance does not change (wall)
                 zenith = nextp['v'].GetAngle()
                 hd = math.sin(zenith) * nextp['distance']
-                dz = height0 - self.hoc # height difference from the height of collimation
-                alpha = math.atan(abs(dz) / hd)
-                zenith1 = math.pi / 2.0 + alpha if dz < 0 else math.pi / 2.0 - alpha
-                self.ts.MoveRel(Angle(0), Angle(zenith1-zenith))
-                ans = self.ts.Measure()
-                if 'errCode' in ans:
+                ts.MoveRel(zero, Angle(math.atan2(hd, dz) - zenith))
+                ans = ts.Measure()
+                if 'errorCode' in ans:
                     logging.warning('Cannot measure point, skip')
                     w = False
                     break
                 index += 1
-                if index > self.maxiter or \
-                    self.ts.measureIface.state != self.ts.measureIface.IF_OK:
+                if iface.state != ok:
                     w = False
-                    self.ts.measureIface.state = self.ts.measureIface.IF_OK
+                    iface.state = ok
                     logging.warning('Missing measurement')
                     break
-                nextp = self.ts.GetMeasure()
+                nextp = ts.GetMeasure()
                 if self.invalid(nextp):
                     w = False
                     break
@@ -215,11 +236,9 @@ class HorizontalSection():
             if 'distance' in nextp and startp0 is None:
                 startp0 = nextp # store first valid point on section
             if 'distance' in nextp and w:
-                #coord = self.Coords(nextp)
-                res = dict(list(nextp.items()) + list(coords.items()))
-                self.wrt.WriteData(res)
-            self.ts.MoveRel(self.stepinterval, Angle(0))
-            act += self.stepinterval
+                self.wrt.WriteData({**nextp, **coords})
+            ts.MoveRel(step, zero)
+            act += step_rad
         # rotate back to start
         if startp0 is not None:
             self.ts.Move(startp0['hz'], startp0['v'])
@@ -426,13 +445,12 @@ if __name__ == "__main__":
         print("serial error")
         sys.exit(1)
     # measure interface for instrument
-    if re.search('120[0-9]$', params['stationtype']):
+    if RE_1200.search(params['stationtype']):
         mu = LeicaTPS1200()
-    elif re.search('110[0-9]$', params['stationtype']):
+    elif RE_1100.search(params['stationtype']):
         mu = LeicaTCRA1100()
-    elif re.search('550[0-9]$', params['stationtype']):
+    elif RE_5500.search(params['stationtype']):
         mu = Trimble5500()
-        iface.eomRead = b'>'
     elif params['stationtype'].lower() == "axis10":
         mu = Axis10()
     else:
@@ -444,7 +462,7 @@ if __name__ == "__main__":
     ts.SetEDMMode('STANDARD')
     # orientation
     if params['coords']:    # use coords for blind orientation
-        if re.search('\.txt$', params['coords']) or re.search('\.csv$', params['coords']):
+        if RE_CSV.search(params['coords']):
             rd = CsvReader(fname=params['coords'], \
                            filt=['id', 'east', 'north', 'elev'])
         else:
@@ -498,6 +516,9 @@ if __name__ == "__main__":
     wrt = CsvWriter(angle='DMS', dist='.3f',
                     filt=['id', 'east', 'north', 'elev', 'hz', 'v', 'distance'],
                     fname=params['wrt'], mode='a', sep=';', pid=params['pid'])
+    # write in background not to delay the observations
+    wrt = ThreadWriter(wrt)
+    atexit.register(wrt.Close)    # flush queue on exit
     # set station coordinates
     if isinstance(mu, Trimble5500):
         print("Please change to reflectorless EDM mode (MNU 722 from keyboard)")
@@ -20,13 +20,17 @@ Sample application of Ulyxes PyAPI to measure to a moving prism/object.
     :param argv[3] (edm): edm mode STANDARD/FAST, default FAST
     :param argv[4] (port): serial port, use a filename for local iface, default COM7
     :param argv[5] (file): output file, data are appended to the end of the file
+    :param argv[6] (rate): observation rate [Hz], default as fast as possible
 """
 import re
 import sys
 import logging
 import math
+import os
 import os.path
 import signal
+import time
+import atexit
 
 # check PYTHONPATH
 if len([p for p in sys.path if 'pyapi' in p]) == 0:
@@ -43,12 +47,54 @@ from totalstation import TotalStation
 from localiface import LocalIface
 from csvwriter import CsvWriter
 from echowriter import EchoWriter
+from threadwriter import ThreadWriter
 from leicatcra1100 import LeicaTCRA1100
 from leicatca1800 import LeicaTCA1800
 from leicatps1200 import LeicaTPS1200
 from trimble5500 import Trimble5500
 from axis10 import Axis10
 
+# patterns for command line parameters
+RE_1100 = re.compile('110[0-9]$')
+RE_1200 = re.compile('120[0-9]$')
+RE_1800 = re.compile('180[0-9]$')
+RE_5500 = re.compile('550[0-9]$')
+RE_SERIAL = re.compile('^COM[0-9]+|^/dev/.*tty')
+
+class Pacer():
+    """ Wait for the ticks of a fixed rate clock, timerfd is used on Linux
+        (Python 3.13+), monotonic clock and sleep elsewhere
+
+        :param rate: number of ticks per second
+    """
+    def __init__(self, rate):
+        """ initialize """
+        self.interval = 1.0 / rate
+        self.tfd = None
+        if hasattr(os, 'timerfd_create'):
+            self.tfd = os.timerfd_create(time.CLOCK_MONOTONIC)
+            os.timerfd_settime(self.tfd, initial=self.interval,
+                               interval=self.interval)
+        self.next = time.monotonic()
+
+    def Close(self):
+        """ release the timer """
+        if self.tfd is not None:
+            os.close(self.tfd)
+            self.tfd = None
+
+    def Wait(self):
+        """ block until the next tick """
+        if self.tfd is not None:
+            os.read(self.tfd, 8)   # number of expirations, missed ticks merged
+            return
+        self.next += self.interval
+        delay = self.next - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        else:
+            self.next = time.monotonic()    # late, do not catch up
+
 def exit_on_ctrl_c(signal, frame):
     """ catch interrupt (Ctrl/C) and exit gracefully """
     print("\nCtrl/C was pressed, exiting...")
@@ -58,19 +104,19 @@ if __name__ == "__main__":
     logging.getLogger().setLevel(logging.ERROR)
     # Process command line parameters
     if len(sys.argv) == 1:
-        print('Usage: {} instrument [mode [EDM_mode [serial [output_csv]]]]'.format(sys.argv[0]))
+        print('Usage: {} instrument [mode [EDM_mode [serial [output_csv [rate]]]]]'.format(sys.argv[0]))
         exit()
     # Instrument type
     if len(sys.argv) > 1:
-        if re.search('110[0-9]$', sys.argv[1]):
+        if RE_1100.search(sys.argv[1]):
             mu = LeicaTCRA1100()
-        elif re.search('180[0-9]$', sys.argv[1]):
+        elif RE_1800.search(sys.argv[1]):
             mu = LeicaTCA1800()
-        elif re.search('120[0-9]$', sys.argv[1]):
+        elif RE_1200.search(sys.argv[1]):
             mu = LeicaTPS1200()
-        elif re.search('550[0-9]$', sys.argv[1]):
+        elif RE_5500.search(sys.argv[1]):
             mu = Trimble5500()
-        elif sys.argv[1]lower() == "axis10":
+        elif sys.argv[1].lower() == "axis10":
             mu = Axis10()
         else:
             mu = LeicaTPS1200()
@@ -88,11 +134,21 @@ if __name__ == "__main__":
     edm = 'FAST'
     if len(sys.argv) > 3:
         edm = sys.argv[3]
+    # Observation rate
+    rate = None
+    if len(sys.argv) > 6:
+        try:
+            rate = float(sys.argv[6])
+        except ValueError:
+            rate = 0
+        if not rate > 0:    # NaN also rejected
+            print('Rate must be a positive number [Hz]: {}'.format(sys.argv[6]))
+            sys.exit(1)
     # Serial port
     com = '/dev/ttyUSB0'
     if len(sys.argv) > 4:
         com = sys.argv[4]
-    if re.search('^COM[0-9]+', com) or re.search('^/dev/.*tty', com):
+    if RE_SERIAL.search(com):
         iface = SerialIface("rs-232", com)
     else:
         iface = LocalIface("testIface", com) # Local iface for testing the module
@@ -107,6 +163,13 @@ if __name__ == "__main__":
     else:
         wrt = EchoWriter(angle='GON', dist='.3f', dt='%Y-%m-%d %H:%M:%S.%f',
                          filt=['id', 'datetime', 'hz', 'v', 'distance', 'east', 'north', 'elev'])
+    pacer = None
+    if rate is not None:
+        pacer = Pacer(rate)
+    # write in background not to disturb the rate of observations
+    wrt = ThreadWriter(wrt)
+    atexit.register(wrt.Close)    # flush queue on exit
+    write = wrt.WriteData
     signal.signal(signal.SIGINT, exit_on_ctrl_c)    # catch Ctrl/C
     ts = TotalStation("Leica", mu, iface)
     slopeDist = 0
@@ -127,12 +190,13 @@ if __name__ == "__main__":
             ts.SetLock(1)
             ts.LockIn()
             if mode == 5:
-                last_hz = measurement['hz'] # direction of last measured point
-                last_v = measurement['v']
-                prev_hz = measurement['hz'] # direction of last measured point
-                prev_v = measurement['v']
+                # directions are compared as radians
+                last_hz = measurement['hz'].GetAngle() # direction of last measured point
+                last_v = measurement['v'].GetAngle()
+                prev_hz = last_hz # direction of last measured point
+                prev_v = last_v
                 moving = True
-                limit = Angle('0-03-00', 'DMS') # minimal angle change to measure
+                limit = Angle('0-03-00', 'DMS').GetAngle() # minimal angle change to measure
                 n = 0
     else:
         try:
@@ -141,71 +205,76 @@ if __name__ == "__main__":
             pass
 
     # infinite loop of measuring
-    while ts.measureIface.state == ts.measureIface.IF_OK:
-        if mode == 0:
-            ts.Measure() # distance measurement without ATR
-            measurement = ts.GetMeasure()
-        elif mode == 1:
-            ts.MoveRel(Angle(0), Angle(0), 1)  # aim on target with ATR
-            ts.Measure()
-            measurement = ts.GetMeasure()
-        elif mode == 2:
-            # aim on target with ATR without distance measurements
-            ts.MoveRel(Angle(0), Angle(0), 1)
-            measurement = ts.GetAngles()
-        elif mode == 3:
-            measurement = ts.GetAngles() # get angles only
-        elif mode == 4:
-            # get distance measurement with targeting mode
-            ts.Measure()
-            measurement = ts.GetMeasure()
-        elif mode == 5:
-            # go and stop, store full measurements within the limitation
-            measurement = ts.GetAngles()
-
-            if moving:
-                if abs(prev_hz.GetAngle() - measurement['hz'].GetAngle()) < limit.GetAngle() and \
-                   abs(prev_v.GetAngle() - measurement['v'].GetAngle()) < limit.GetAngle():
-                    n += 1
-                    # store if the measured values within the angle limitation three times
-                    if n <= 3:
+    try:
+        while ts.measureIface.state == ts.measureIface.IF_OK:
+            if pacer is not None:
+                pacer.Wait()
+            if mode == 0:
+                ts.Measure() # distance measurement without ATR
+                measurement = ts.GetMeasure()
+            elif mode == 1:
+                ts.MoveRel(Angle(0), Angle(0), 1)  # aim on target with ATR
+                ts.Measure()
+                measurement = ts.GetMeasure()
+            elif mode == 2:
+                # aim on target with ATR without distance measurements
+                ts.MoveRel(Angle(0), Angle(0), 1)
+                measurement = ts.GetAngles()
+            elif mode == 3:
+                measurement = ts.GetAngles() # get angles only
+            elif mode == 4:
+                # get distance measurement with targeting mode
+                ts.Measure()
+                measurement = ts.GetMeasure()
+            elif mode == 5:
+                # go and stop, store full measurements within the limitation
+                measurement = ts.GetAngles()
+                m_hz = measurement['hz'].GetAngle()
+                m_v = measurement['v'].GetAngle()
+
+                if moving:
+                    if abs(prev_hz - m_hz) < limit and abs(prev_v - m_v) < limit:
+                        n += 1
+                        # store if the measured values within the angle limitation three times
+                        if n <= 3:
+                            continue
+                        ts.Measure()
+                        measurement = ts.GetMeasure()
+                        moving = False # approximately standing
+                        last_hz = measurement['hz'].GetAngle() # direction of last stored point
+                        last_v = measurement['v'].GetAngle()
+                        prev_hz = last_hz # direction of last examined point
+                        prev_v = last_v
+                        n = 0 # start counting again if the last examind point is stored
+                    else:
+                        prev_hz = m_hz
+                        prev_v = m_v
                         continue
-                    ts.Measure()
-                    measurement = ts.GetMeasure()
-                    moving = False # approximately standing
-                    last_hz = measurement['hz'] # direction of last stored point
-                    last_v = measurement['v']
-                    prev_hz = measurement['hz'] # direction of last examined point
-                    prev_v = measurement['v']
-                    n = 0 # start counting again if the last examind point is stored
                 else:
-                    prev_hz = measurement['hz']
-                    prev_v = measurement['v']
+                    if abs(last_hz - m_hz) >= limit or abs(last_v - m_v) >= limit:
+                        moving = True # still moving
                     continue
-            else:
-                if abs(last_hz.GetAngle() - measurement['hz'].GetAngle()) >= limit.GetAngle() or \
-                   abs(last_v.GetAngle() - measurement['v'].GetAngle()) >= limit.GetAngle():
-                    moving = True # still moving
-                continue
 
-        #  Get each measurement data
-        if 'distance' in measurement:  # Check existance of 'distance' key
-            slopeDist = measurement['distance']
-        if 'hz' in measurement:  # Check existence of 'hz' key
-            hz = measurement['hz']
-        if 'v' in measurement:  # Check existence of 'v' key
-            v = measurement['v']
-
-        # Compute relative coordinates according to the instrument origin
-        if 'hz' in measurement and 'v' in measurement:
-            measurement['east'] = slopeDist * math.sin(v.GetAngle()) * \
-                math.sin(hz.GetAngle())
-            measurement['north'] = slopeDist * math.sin(v.GetAngle()) * \
-                math.cos(hz.GetAngle())
-            measurement['elev'] = slopeDist * math.cos(v.GetAngle())
-
-            # Store in file the measurements
-            wrt.WriteData(measurement)
-            #print(measurement)
-        else:
-            print("Some measurement data(s) are missing...")
+            #  Get each measurement data
+            if 'distance' in measurement:  # Check existance of 'distance' key
+                slopeDist = measurement['distance']
+            hz = measurement.get('hz')
+            v = measurement.get('v')
+
+            # Compute relative coordinates according to the instrument origin
+            if hz is not None and v is not None:
+                v_rad = v.GetAngle()
+                hz_rad = hz.GetAngle()
+                hd = slopeDist * math.sin(v_rad)
+                measurement['east'] = hd * math.sin(hz_rad)
+                measurement['north'] = hd * math.cos(hz_rad)
+                measurement['elev'] = slopeDist * math.cos(v_rad)
+
+                # Store in file the measurements
+                write(measurement)
+                #print(measurement)
+            else:
+                print("Some measurement data(s) are missing...")
+    finally:
+        if pacer is not None:
+            pacer.Close()
@@ -0,0 +1,16 @@
+""" Optional compiled extensions, metadata is in setup.cfg
+
+    Build in place: python setup.py build_ext --inplace
+"""
+from setuptools import setup
+
+try:
+    from Cython.Build import cythonize
+    ext_modules = cythonize(['pyapi/trimble5500_parse.pyx',
+                             'pyapi/_angle_c.pyx'],
+                            compiler_directives={'language_level': 3})
+except ImportError:
+    # Cython not installed, pure Python parsers are used
+    ext_modules = []
+
+setup(ext_modules=ext_modules)